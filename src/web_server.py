@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
+import atexit
+import gzip
+import hashlib
 import http.server
 import json
 import logging
 import logging.handlers
+import mmap
 import os
+import re
 import signal
 import socketserver
 import subprocess
 import sys
+import threading
+import time
 
-from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from collections import OrderedDict
+from queue import SimpleQueue
+from typing import Any, Optional, Tuple
 
 # Configuration
 LOG_FILE: str = '/config/logs/sync.log'
@@ -39,168 +47,205 @@ file_handler.setFormatter(formatter)
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
 
-# Add handlers
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+# Request threads enqueue records; a single background listener thread does
+# the actual file/console writes so no request blocks on handler locks or
+# a rotation rename
+_log_queue: 'SimpleQueue[Any]' = SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, file_handler, console_handler
+)
+_log_listener.start()
 
-class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
-    
-    def log_message(self, format: str, *args) -> None:
-        '''Override to use our logger'''
-        logger.info(f'{self.address_string()} - {format % args}')
+def _stop_log_listener() -> None:
+    # The final flush can land after stderr is already closed at shutdown
+    try:
+        _log_listener.stop()
+    except Exception:
+        pass
 
-    def safe_read_log(self, log_path: str, max_lines: int = 10000) -> str:
-        '''Safely read log file with size limits and error summary'''
-        try:
-            if not os.path.exists(log_path):
-                return 'Log file not found'
-            
-            file_size = os.path.getsize(log_path)
-            if file_size > MAX_LOG_SIZE:
-                # Read only the last part of large files
-                with open(log_path, 'rb') as f:
-                    f.seek(-MAX_LOG_SIZE, 2)
-                    content = f.read().decode('utf-8', errors='ignore')
-                    lines = content.splitlines()
-                    error_summary = self._generate_error_summary(
-                        lines, offset=0, truncated=True)
-                    full_content = '\n'.join(lines)
-                    return (
-                        f'{error_summary}[LOG TRUNCATED - showing last '
-                        f'{MAX_LOG_SIZE} bytes]\n{full_content}')
-            else:
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    lines = [line.rstrip('\n') for line in lines]
-                    
-                    if len(lines) > max_lines:
-                        # Generate error summary for all lines, then truncate display
-                        error_summary = self._generate_error_summary(lines)
-                        truncated_lines = '\n'.join(lines[-max_lines:])
-                        return (
-                            f'{error_summary}[LOG TRUNCATED - showing last '
-                            f'{max_lines} lines]\n{truncated_lines}')
-                    else:
-                        error_summary = self._generate_error_summary(lines)
-                        return f'{error_summary}{chr(10).join(lines)}'
-        except Exception as e:
-            logger.error(f'Error reading log file {log_path}: {e}')
-            return f'Error reading log file: {str(e)}'
+atexit.register(_stop_log_listener)
 
-    def _generate_error_summary(self, lines: List[str], offset: int = 0, truncated: bool = False) -> str:
-        '''Generate a summary of errors found in the log with line numbers (size-limited)'''
-        errors = []
-        error_keywords = ['[ERROR]', '[CRITICAL]', 'ERROR:', 'CRITICAL:', 'Failed', 'Exception:', 'Traceback', 'Error:']
-        max_errors_to_show = 15  # Limit errors shown to prevent summary from getting too large
-        max_summary_chars = 2000  # Overall character limit for the entire summary
-        
-        for i, line in enumerate(lines, start=1 + offset):
-            if len(errors) >= max_errors_to_show * 2:  # Search more but limit display
-                break
-                
-            line_upper = line.upper()
-            if any(keyword.upper() in line_upper for keyword in error_keywords):
-                # Limit error line length for summary display
-                error_entry = f'Line {i}: {line}'
-                errors.append(error_entry)
-        
-        if not errors:
-            return '🟢 ERROR SUMMARY: No errors found\n' + '='*50 + '\n\n'
-        
-        error_count = len(errors)
-        summary_header = f'🔴 ERROR SUMMARY: {error_count} error{"s" if error_count != 1 else ""} found'
-        if truncated:
-            summary_header += ' (in displayed portion)'
-        summary_header += '\n' + '='*50 + '\n'
-        
-        # Limit to first max_errors_to_show errors in summary
-        displayed_errors = errors[:max_errors_to_show]
-        error_lines = '\n'.join(displayed_errors)
-        
-        if len(errors) > max_errors_to_show:
-            error_lines += f'\n... and {len(errors) - max_errors_to_show} more errors (see full log below)'
-        
-        summary_content = summary_header + error_lines + '\n' + '='*50 + '\n\n'
-        
-        # Final safety check - truncate entire summary if it's too long
-        if len(summary_content) > max_summary_chars:
-            truncation_point = max_summary_chars - 100  # Leave room for truncation message
-            summary_message = '\n[ERROR SUMMARY TRUNCATED - too many errors]\n' + '='*50 + '\n\n'
-            summary_content = summary_content[:truncation_point] + summary_message
-        
-        return summary_content
+# Serializes log truncation across handler threads
+_clear_lock = threading.Lock()
 
-    def get_sync_status(self) -> Tuple[str, str]:
-        '''Check if sync process is running based on last few log lines with improved robustness'''
+# get_sync_status memo: (path, mtime_ns, size) signature of the last parse,
+# so concurrent polls against an unchanged log skip the read entirely
+_status_cache = {'sig': None, 'value': None}
+_status_lock = threading.Lock()
+
+if hasattr(os, 'preadv') and hasattr(os, 'RWF_NOWAIT'):
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        '''Positional read that first attempts a non-blocking page-cache hit'''
+        buf = bytearray(size)
         try:
-            if not os.path.exists(LOG_FILE):
-                return '⚪ Unknown', '#7d8590'
-            
-            # Read last 5 lines to check status
-            with open(LOG_FILE, 'rb') as f:
-                # Go to end and read backwards to get last lines efficiently
-                f.seek(0, 2)  # Go to end
-                file_size = f.tell()
-                if file_size == 0:
-                    return '⚪ No logs', '#7d8590'
-                
-                # Read last 1KB to capture last few lines
-                read_size = min(1024, file_size)
-                f.seek(-read_size, 2)
-                content = f.read().decode('utf-8', errors='ignore')
-                lines = content.strip().split('\n')[-5:]  # Get last 5 lines
-            
-            # Check for completion indicators in last lines
-            for line in reversed(lines):
-                line = line.strip()
-                if 'All syncs completed successfully' in line:
-                    return '🟢 Completed', '#3fb950'
-                elif 'Some syncs failed. Check logs for details.' in line:
-                    return '🟡 Completed with errors', '#d29922'
-                elif 'Starting sync process.' in line:
-                    return '🔵 Running', '#79c0ff'
-                elif 'Logs cleared via web interface' in line:
-                    return '⚪ No run yet', '#7d8590'
-            
-            # Default to running if no clear completion status found
-            return '🔵 Running', '#79c0ff'
-            
-        except Exception as e:
-            logger.error(f'Error checking sync status: {e}')
-            return '❌ Error', '#f85149'
+            n = os.preadv(fd, [buf], offset, os.RWF_NOWAIT)
+        except OSError:
+            return os.pread(fd, size, offset)
+        if n == size:
+            return bytes(buf)
+        # Cold cache or short read: take the blocking path for the full range
+        return os.pread(fd, size, offset)
+else:
+    def _pread(fd: int, size: int, offset: int) -> bytes:
+        return os.pread(fd, size, offset)
 
-    def generate_html_page(self, sync_log: str, load_avg: Tuple[float, float, float]) -> str:
-        '''Generate the HTML page with enhanced features'''
-        # Safe log size calculation with proper error handling
+# Files at or above this size are tail-scanned through mmap instead of
+# chunked preads; below it the map/unmap setup outweighs the copy saved
+_MMAP_MIN_SIZE = 4 * 1024 * 1024
+
+# safe_read_log memo: rendered tail+summary keyed on the file's stat
+# signature, so page refreshes against an idle log cost one stat
+_LOG_READ_CACHE_SIZE = 8
+_log_read_cache: 'OrderedDict[Tuple[str, int, int, int], str]' = OrderedDict()
+_log_read_lock = threading.Lock()
+
+def _safe_stat(path: str) -> Optional[os.stat_result]:
+    '''Single-stat replacement for the exists+getsize double syscall'''
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def _write_line(path: str, line: bytes, truncate: bool = True) -> None:
+    '''Write a single line through the raw fd layer, bypassing buffered text I/O'''
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if truncate else os.O_APPEND)
+    fd = os.open(path, flags, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+# Per-thread reader pooled across get_sync_status calls; reopened only when
+# the log is rotated/replaced (inode change) or the thread has none yet
+_status_reader = threading.local()
+
+# Completion markers matched against the raw log tail, most recent one wins
+_STATUS_MARKERS: 'Tuple[Tuple[bytes, Tuple[str, str]], ...]' = (
+    (b'All syncs completed successfully', ('🟢 Completed', '#3fb950')),
+    (b'Some syncs failed. Check logs for details.', ('🟡 Completed with errors', '#d29922')),
+    (b'Starting sync process.', ('🔵 Running', '#79c0ff')),
+    (b'Logs cleared via web interface', ('⚪ No run yet', '#7d8590')),
+)
+
+def _status_file():
+    f = getattr(_status_reader, 'f', None)
+    stat = os.stat(LOG_FILE)
+    if f is not None:
         try:
-            log_size = (os.path.getsize(LOG_FILE) / (1024 * 1024)) if os.path.exists(LOG_FILE) else 0
-        except (OSError, IOError):
-            log_size = 0
-            
-        last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        sync_status, status_color = self.get_sync_status()
-        
-        css_styles = '''
-        body { 
-            font-family: 'Monaco', 'Menlo', monospace; margin: 0; 
-            background: #0d1117; color: #c9d1d9; 
+            if os.fstat(f.fileno()).st_ino == stat.st_ino:
+                return f
+        except (OSError, ValueError):
+            pass
+        try:
+            f.close()
+        except OSError:
+            pass
+    f = open(LOG_FILE, 'rb')
+    _status_reader.f = f
+    return f
+
+# Second-resolution timestamp cache: every request in the same second
+# reuses one strftime result. Whole-tuple swap, so no lock needed.
+_now_cache: 'Tuple[int, str]' = (0, '')
+
+def _now_str() -> str:
+    global _now_cache
+    t = int(time.time())
+    sec, text = _now_cache
+    if t != sec:
+        text = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t))
+        _now_cache = (t, text)
+    return text
+
+# Last rendered dynamic page fragment, keyed on (log size, log mtime,
+# wall-clock second): back-to-back refreshes within a second reuse it.
+_page_cache: 'Tuple[Optional[Tuple[int, int, int]], bytes]' = (None, b'')
+
+# Load average refresh: /proc/loadavg only updates every few seconds, so
+# re-reading it per request is waste. On platforms without getloadavg the
+# first OSError pins (0, 0, 0) permanently.
+_LOADAVG_TTL = 2.0
+_loadavg_cache: 'Tuple[float, Tuple[float, float, float], bool]' = (
+    0.0, (0.0, 0.0, 0.0), True)
+
+def _cached_loadavg() -> Tuple[float, float, float]:
+    global _loadavg_cache
+    expires, value, supported = _loadavg_cache
+    if supported:
+        now = time.monotonic()
+        if now >= expires:
+            try:
+                value = os.getloadavg()
+                _loadavg_cache = (now + _LOADAVG_TTL, value, True)
+            except OSError:
+                value = (0.0, 0.0, 0.0)
+                _loadavg_cache = (0.0, value, False)
+    return value
+
+# /api/status is polled at high rate; amortize the stat syscall across
+# polls. A single tuple assignment is atomic under the GIL, so readers
+# need no lock.
+_LOG_STAT_TTL = 0.5
+_log_stat_cache: 'Tuple[float, Optional[os.stat_result]]' = (0.0, None)
+
+def _cached_log_stat() -> Optional[os.stat_result]:
+    global _log_stat_cache
+    now = time.monotonic()
+    expires, stat = _log_stat_cache
+    if now < expires:
+        return stat
+    stat = _safe_stat(LOG_FILE)
+    _log_stat_cache = (now + _LOG_STAT_TTL, stat)
+    return stat
+
+def _invalidate_status_cache() -> None:
+    global _log_stat_cache
+    with _status_lock:
+        _status_cache['sig'] = None
+        _status_cache['value'] = None
+    _log_stat_cache = (0.0, None)
+
+# Error keywords matched case-insensitively in a single pass; the pattern is
+# bytes so the scan runs on the raw tail before any decode. Used as the bulk
+# prefilter and as the fallback for lines without a timestamp stamp.
+_ERROR_RE = re.compile(
+    rb'\[ERROR\]|\[CRITICAL\]|ERROR:|CRITICAL:|Failed|Exception:|Traceback|Error:',
+    re.IGNORECASE
+)
+
+# Lines written by sync_script carry a fixed '[YYYY-MM-DD hh:mm:ss] [LEVEL]'
+# prefix; an anchored match() classifies those by level and fails at position
+# 0 for the rest, instead of letting the keyword alternation retry at every
+# byte of the line. Only unstamped lines (tool output passed through
+# verbatim) fall back to the unanchored keyword scan.
+_STAMPED_LINE_RE = re.compile(rb'\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] \[([A-Z]+)\]')
+_ERROR_LEVELS = frozenset((b'ERROR', b'CRITICAL', b'FATAL'))
+
+# The CSS and the HTML frame around the log view are fully static, so they are
+# built once at import time. Only the small dynamic middle (timestamp, load,
+# log size, status and the log tail itself) is formatted per request.
+_CSS_STYLES = '''
+        body {
+            font-family: 'Monaco', 'Menlo', monospace; margin: 0;
+            background: #0d1117; color: #c9d1d9;
         }
         .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
-        .header { 
-            background: #161b22; padding: 20px; border-radius: 8px; 
-            margin-bottom: 20px; border: 1px solid #30363d; 
+        .header {
+            background: #161b22; padding: 20px; border-radius: 8px;
+            margin-bottom: 20px; border: 1px solid #30363d;
         }
         h1 { color: #58a6ff; margin: 0; font-size: 2.2em; }
-        .controls-status { 
-            display: flex; justify-content: space-between; align-items: center; 
-            padding: 15px; background: #161b22; border: 1px solid #30363d; 
-            border-radius: 8px; margin-bottom: 20px; 
+        .controls-status {
+            display: flex; justify-content: space-between; align-items: center;
+            padding: 15px; background: #161b22; border: 1px solid #30363d;
+            border-radius: 8px; margin-bottom: 20px;
         }
         .system-status { color: #7d8590; font-size: 14px; }
         .controls { display: flex; gap: 10px; flex-wrap: wrap; }
-        .btn { 
-            background: #21262d; color: #f0f6fc; padding: 12px 24px; 
-            border: 1px solid #30363d; border-radius: 6px; cursor: pointer; 
+        .btn {
+            background: #21262d; color: #f0f6fc; padding: 12px 24px;
+            border: 1px solid #30363d; border-radius: 6px; cursor: pointer;
             font-family: inherit; font-size: 14px; transition: all 0.2s ease;
         }
         .btn:hover { background: #30363d; }
@@ -213,12 +258,12 @@ class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
         .log-container { display: grid; grid-template-columns: 1fr; gap: 20px; }
         .log-section { background: #0d1117; border: 1px solid #30363d; border-radius: 8px; }
         .log-section.full-width { grid-column: 1; }
-        .log-header { 
-            background: #161b22; padding: 15px; border-bottom: 1px solid #30363d; 
-            font-weight: bold; 
+        .log-header {
+            background: #161b22; padding: 15px; border-bottom: 1px solid #30363d;
+            font-weight: bold;
         }
-        .log-content { 
-            background: #010409; padding: 20px; max-height: 75vh; overflow-y: auto; 
+        .log-content {
+            background: #010409; padding: 20px; max-height: 75vh; overflow-y: auto;
             white-space: pre-wrap; font-size: 13px; line-height: 1.4;
             scrollbar-width: thin; scrollbar-color: #30363d #0d1117;
         }
@@ -236,27 +281,34 @@ class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
             .btn { width: 100%; }
         }
         '''
-        
-        return f'''<!DOCTYPE html>
+
+_CSS_BYTES = _CSS_STYLES.encode('utf-8')
+_CSS_ETAG = f'"{hashlib.md5(_CSS_BYTES).hexdigest()}"'
+
+_HTML_PREFIX = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <title>Rsync Backup Management</title>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>{css_styles}</style>
+    <link rel="stylesheet" href="/static/app.css?v={hashlib.md5(_CSS_BYTES).hexdigest()}">
 </head>
 <body>
     <div class="container">
         <div class="header">
-            <h1>📄 Rsync Backup Management</h1>
-            <div class="timestamp">Last updated: {last_updated}</div>
+            <h1>📄 Rsync Backup Management</h1>'''
+
+# %-formatting slots: last_updated, load avg (x3), log size, status color,
+# sync status, log content
+_HTML_DYNAMIC_TMPL = '''
+            <div class="timestamp">Last updated: %s</div>
         </div>
-        
+
         <div class="controls-status">
             <div class="system-status">
-                💾 Load: {load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f} | 
-                📄 Log Size: {log_size:.2f} MB | 
-                <span style="color: {status_color}; font-weight: bold;">{sync_status}</span>
+                💾 Load: %.2f, %.2f, %.2f |
+                📄 Log Size: %.2f MB |
+                <span id="syncStatus" style="color: %s; font-weight: bold;">%s</span>
             </div>
             <div class="controls">
                 <button class="btn primary" onclick="runSync()">▶️ Run Sync Now</button>
@@ -269,147 +321,582 @@ class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
             <div class="log-section full-width">
                 <div class="log-header">📋 Sync Logs</div>
                 <div class="log-content" id="syncLogs">
-                    {sync_log if sync_log.strip() else 'No sync logs yet...'}
+                    %s
                 </div>
             </div>
         </div>
-    </div>
+    </div>'''
 
-    <script>
-        function apiRequest(endpoint, method = 'GET', data = null) {{
-            const options = {{
+_APP_JS = '''
+        function apiRequest(endpoint, method = 'GET', data = null) {
+            const options = {
                 method: method,
-                headers: {{'Content-Type': 'application/json'}}
-            }};
+                headers: {'Content-Type': 'application/json'}
+            };
             if (data) options.body = JSON.stringify(data);
-            
+
             return fetch(endpoint, options)
-                .then(response => {{
-                    if (!response.ok) throw new Error(`HTTP ${{response.status}}`);
+                .then(response => {
+                    if (!response.ok) throw new Error(`HTTP ${response.status}`);
                     return response;
-                }});
-        }}
+                });
+        }
 
-        function showNotification(message, type = 'info') {{
-            const colors = {{
+        function showNotification(message, type = 'info') {
+            const colors = {
                 'success': '#3fb950',
-                'error': '#f85149', 
+                'error': '#f85149',
                 'warning': '#d29922',
                 'info': '#79c0ff'
-            }};
-            
+            };
+
             const notification = document.createElement('div');
             notification.style.cssText = `
                 position: fixed; top: 20px; right: 20px; z-index: 1000;
-                background: ${{colors[type] || colors.info}}; color: white; padding: 15px 20px;
+                background: ${colors[type] || colors.info}; color: white; padding: 15px 20px;
                 border-radius: 6px; box-shadow: 0 4px 12px rgba(0,0,0,0.3);
                 max-width: 300px; word-wrap: break-word;
             `;
             notification.textContent = message;
             document.body.appendChild(notification);
-            
+
             setTimeout(() => notification.remove(), 4000);
-        }}
+        }
+
+        function refreshLogs() {
+            apiRequest('/api/snapshot')
+                .then(response => response.json())
+                .then(data => {
+                    const logs = document.getElementById('syncLogs');
+                    if (logs) logs.textContent = data.tail || 'No sync logs yet...';
+                    const status = document.getElementById('syncStatus');
+                    if (status) {
+                        status.textContent = data.status;
+                        status.style.color = data.color;
+                    }
+                })
+                .catch(() => location.reload());
+        }
 
-        function clearLogs() {{
-            if (confirm('Are you sure you want to clear all logs?')) {{
+        function clearLogs() {
+            if (confirm('Are you sure you want to clear all logs?')) {
                 apiRequest('/clear', 'POST')
-                .then(() => {{
+                .then(() => {
                     showNotification('Logs cleared successfully!', 'success');
-                    setTimeout(() => location.reload(), 1000);
-                }})
-                .catch(err => showNotification(`Error clearing logs: ${{err.message}}`, 'error'));
-            }}
-        }}
-
-        function runSync() {{
-            if (confirm('Run sync script now? This may take several minutes.')) {{
+                    setTimeout(refreshLogs, 1000);
+                })
+                .catch(err => showNotification(`Error clearing logs: ${err.message}`, 'error'));
+            }
+        }
+
+        function runSync() {
+            if (confirm('Run sync script now? This may take several minutes.')) {
                 showNotification('Sync started! Check logs for progress...', 'info');
                 apiRequest('/run', 'POST')
-                .then(() => {{
-                    setTimeout(() => location.reload(), 2000);
-                }})
-                .catch(err => showNotification(`Error starting sync: ${{err.message}}`, 'error'));
-            }}
-        }}
-        
+                .then(() => {
+                    setTimeout(refreshLogs, 2000);
+                })
+                .catch(err => showNotification(`Error starting sync: ${err.message}`, 'error'));
+            }
+        }
+
         // Keyboard shortcuts
-        document.addEventListener('keydown', (e) => {{
-            if (e.ctrlKey || e.metaKey) {{
-                switch(e.key) {{
+        document.addEventListener('keydown', (e) => {
+            if (e.ctrlKey || e.metaKey) {
+                switch(e.key) {
                     case 'r': e.preventDefault(); location.reload(); break;
                     case 'Enter': e.preventDefault(); runSync(); break;
-                }}
-            }}
-        }});
-    </script>
+                }
+            }
+        });
+'''
+
+_JS_BYTES = _APP_JS.encode('utf-8')
+_JS_ETAG = f'"{hashlib.md5(_JS_BYTES).hexdigest()}"'
+
+_HTML_SUFFIX = f'''
+
+    <script src="/static/app.js?v={hashlib.md5(_JS_BYTES).hexdigest()}" defer></script>
 </body>
 </html>'''
 
+_HTML_PREFIX_BYTES = _HTML_PREFIX.encode('utf-8')
+_HTML_SUFFIX_BYTES = _HTML_SUFFIX.encode('utf-8')
+
+# Only bother compressing once the page is dominated by log text
+_GZIP_MIN_SIZE = 4096
+
+# Escape log text for HTML in one C-level translate pass
+_HTML_ESC = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+
+# Fixed-shape JSON payloads, byte-identical to what json.dumps produced
+_JSON_SUCCESS = b'{"status": "success"}'
+_JSON_STARTED_TMPL = b'{"status": "started", "pid": %d}'
+_JSON_ERR_START = b'{"status": "error", "message": "Failed to start sync process"}'
+_JSON_ERR_INTERNAL = b'{"status": "error", "message": "Internal server error"}'
+_API_STATUS_TMPL = b'{"timestamp": "%b", "log_exists": %b, "log_size": %b, "server_uptime": "online"}'
+
+_FAVICON_BYTES = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 32 32">
+                    <rect width="32" height="32" fill="#161b22"/>
+                    <rect x="8" y="6" width="16" height="20" rx="1" fill="#58a6ff" stroke="#30363d"/>
+                    <line x1="10" y1="10" x2="22" y2="10" stroke="#161b22" stroke-width="1"/>
+                    <line x1="10" y1="13" x2="22" y2="13" stroke="#161b22" stroke-width="1"/>
+                    <line x1="10" y1="16" x2="18" y2="16" stroke="#161b22" stroke-width="1"/>
+                </svg>'''.encode('utf-8')
+
+_FAVICON_GZ = gzip.compress(_FAVICON_BYTES, 9)
+
+class EnhancedLogHandler(http.server.BaseHTTPRequestHandler):
+
+    # Keep connections open between requests so the dashboard's follow-up
+    # fetches (favicon, /api/status polling) skip the TCP handshake
+    protocol_version = 'HTTP/1.1'
+
+    # Send small JSON responses immediately instead of waiting for Nagle
+    # to coalesce them with a later segment
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:
+        '''Override to use our logger'''
+        logger.info(f'{self.address_string()} - {format % args}')
+
+    # 128 KiB sits on the flat part of the read-throughput curve; smaller
+    # chunks pay proportionally more syscall overhead per byte
+    def _tail_bytes(self, log_path: str, max_lines: int, chunk_size: int = 131072) -> Tuple[bytes, bool]:
+        '''Read only the last max_lines lines of a file by seeking backwards in chunks'''
+        fd = os.open(log_path, os.O_RDONLY)
+        try:
+            remaining = os.lseek(fd, 0, os.SEEK_END)
+            if remaining >= _MMAP_MIN_SIZE:
+                # For big files let the kernel page the data in on demand:
+                # the backwards newline scan runs zero-copy over the map
+                # and only the final tail slice is copied into the heap
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    pos = remaining
+                    newlines = 0
+                    while newlines <= max_lines:
+                        pos = mm.rfind(b'\n', 0, pos)
+                        if pos < 0:
+                            return mm[:], False
+                        newlines += 1
+                    return mm[pos + 1:], True
+            buf = bytearray()
+            newlines = 0
+            # Count newlines per chunk as it arrives instead of rescanning
+            # the whole accumulated buffer every iteration
+            while remaining > 0 and newlines <= max_lines:
+                read_size = min(chunk_size, remaining)
+                remaining -= read_size
+                chunk = _pread(fd, read_size, remaining)
+                newlines += chunk.count(b'\n')
+                buf[:0] = chunk
+            truncated = remaining > 0
+        finally:
+            os.close(fd)
+        return bytes(buf), truncated
+
+    def safe_read_log(self, log_path: str, max_lines: int = 10000) -> str:
+        '''Safely read log file with size limits and error summary'''
+        try:
+            stat = _safe_stat(log_path)
+            if stat is None:
+                return 'Log file not found'
+
+            # Identical (mtime, size) means an identical render; serve the
+            # memoized tail instead of re-reading and re-scanning
+            cache_key = (log_path, stat.st_mtime_ns, stat.st_size, max_lines)
+            with _log_read_lock:
+                if cache_key in _log_read_cache:
+                    _log_read_cache.move_to_end(cache_key)
+                    return _log_read_cache[cache_key]
+
+            # Read only the tail of the file; memory stays bounded by
+            # max_lines regardless of log size (up to MAX_LOG_SIZE = 500MB)
+            data, truncated = self._tail_bytes(log_path, max_lines)
+            if data.endswith(b'\n'):
+                data = data[:-1]
+
+            # Walk backwards to the cut point instead of splitting and
+            # re-joining the whole tail; the displayed text is a single slice
+            cut = len(data)
+            seen = 0
+            while seen < max_lines:
+                pos = data.rfind(b'\n', 0, cut)
+                if pos < 0:
+                    cut = 0
+                    break
+                cut = pos
+                seen += 1
+            if cut > 0:
+                data = data[cut + 1:]
+                truncated = True
+
+            content = data.decode('utf-8', errors='ignore')
+            if truncated:
+                error_summary = self._generate_error_summary(
+                    data, offset=0, truncated=True)
+                result = (
+                    f'{error_summary}[LOG TRUNCATED - showing last '
+                    f'{max_lines} lines]\n{content}')
+            else:
+                error_summary = self._generate_error_summary(data)
+                result = f'{error_summary}{content}'
+
+            with _log_read_lock:
+                _log_read_cache[cache_key] = result
+                while len(_log_read_cache) > _LOG_READ_CACHE_SIZE:
+                    _log_read_cache.popitem(last=False)
+            return result
+        except Exception as e:
+            logger.error(f'Error reading log file {log_path}: {e}')
+            return f'Error reading log file: {str(e)}'
+
+    def _generate_error_summary(self, data: bytes, offset: int = 0, truncated: bool = False) -> str:
+        '''Generate a summary of errors found in the log with line numbers (size-limited)'''
+        # One C-level scan over the whole buffer decides the common case;
+        # clean logs never pay for the line split or the per-line loop
+        if _ERROR_RE.search(data) is None:
+            return '🟢 ERROR SUMMARY: No errors found\n' + '='*50 + '\n\n'
+
+        errors = []
+        max_errors_to_show = 15  # Limit errors shown to prevent summary from getting too large
+        max_summary_chars = 2000  # Overall character limit for the entire summary
+
+        stamped_match = _STAMPED_LINE_RE.match
+        error_search = _ERROR_RE.search
+
+        # Walk newline to newline instead of splitlines(): line numbers
+        # fall out of the running counter, and the buffer is never
+        # materialized as a list of per-line bytes objects
+        pos = 0
+        size = len(data)
+        line_no = offset
+        while pos < size:
+            if len(errors) >= max_errors_to_show * 2:  # Search more but limit display
+                break
+
+            nl = data.find(b'\n', pos)
+            if nl == -1:
+                nl = size
+            line_no += 1
+
+            # pos/endpos bound the regexes to the current line without
+            # copying it out of the buffer
+            stamped = stamped_match(data, pos, nl)
+            if stamped is not None:
+                # Stamped lines are classified by their level alone, so an
+                # error marker quoted mid-message no longer counts
+                hit = stamped.group(1) in _ERROR_LEVELS
+            else:
+                hit = error_search(data, pos, nl) is not None
+
+            if hit:
+                # Only matching lines are sliced and pay for a decode
+                errors.append(
+                    f"Line {line_no}: {data[pos:nl].decode('utf-8', 'ignore')}")
+            pos = nl + 1
+        
+        if not errors:
+            return '🟢 ERROR SUMMARY: No errors found\n' + '='*50 + '\n\n'
+        
+        error_count = len(errors)
+        summary_header = f'🔴 ERROR SUMMARY: {error_count} error{"s" if error_count != 1 else ""} found'
+        if truncated:
+            summary_header += ' (in displayed portion)'
+        summary_header += '\n' + '='*50 + '\n'
+        
+        # Limit to first max_errors_to_show errors in summary
+        displayed_errors = errors[:max_errors_to_show]
+        error_lines = '\n'.join(displayed_errors)
+        
+        if len(errors) > max_errors_to_show:
+            error_lines += f'\n... and {len(errors) - max_errors_to_show} more errors (see full log below)'
+        
+        summary_content = summary_header + error_lines + '\n' + '='*50 + '\n\n'
+        
+        # Final safety check - truncate entire summary if it's too long
+        if len(summary_content) > max_summary_chars:
+            truncation_point = max_summary_chars - 100  # Leave room for truncation message
+            summary_message = '\n[ERROR SUMMARY TRUNCATED - too many errors]\n' + '='*50 + '\n\n'
+            summary_content = summary_content[:truncation_point] + summary_message
+        
+        return summary_content
+
+    def get_sync_status(self) -> Tuple[str, str]:
+        '''Check if sync process is running based on last few log lines with improved robustness'''
+        try:
+            stat = _safe_stat(LOG_FILE)
+            if stat is None:
+                return '⚪ Unknown', '#7d8590'
+
+            # Reuse the previous result while the log is unchanged; dashboard
+            # tabs poll this every few seconds and the answer rarely moves
+            cache_sig = (LOG_FILE, stat.st_mtime_ns, stat.st_size)
+            with _status_lock:
+                if _status_cache['sig'] == cache_sig:
+                    return _status_cache['value']
+
+            value = self._read_sync_status()
+
+            with _status_lock:
+                _status_cache['sig'] = cache_sig
+                _status_cache['value'] = value
+            return value
+
+        except Exception as e:
+            logger.error(f'Error checking sync status: {e}')
+            return '❌ Error', '#f85149'
+
+    def _read_sync_status(self) -> Tuple[str, str]:
+        '''Parse the tail of the sync log for a completion marker'''
+        # Read last 5 lines to check status
+        f = _status_file()
+        # Go to end and read backwards to get last lines efficiently
+        f.seek(0, 2)  # Go to end
+        file_size = f.tell()
+        if file_size == 0:
+            return '⚪ No logs', '#7d8590'
+
+        # Read last 1KB to capture last few lines
+        read_size = min(1024, file_size)
+        f.seek(-read_size, 2)
+        tail = f.read(read_size)
+
+        # Scan for completion markers directly on the bytes; the marker
+        # closest to the end of the file wins
+        best_pos = -1
+        best_status = None
+        for marker, status in _STATUS_MARKERS:
+            pos = tail.rfind(marker)
+            if pos > best_pos:
+                best_pos = pos
+                best_status = status
+        if best_status is not None:
+            return best_status
+
+        # Default to running if no clear completion status found
+        return '🔵 Running', '#79c0ff'
+
+    def _render_dynamic(self, sync_log: str, load_avg: Tuple[float, float, float]) -> bytes:
+        '''Render the dynamic middle of the page as UTF-8 bytes'''
+        # Safe log size calculation with proper error handling
+        stat = _safe_stat(LOG_FILE)
+        log_size = stat.st_size / (1024 * 1024) if stat else 0
+
+        last_updated = _now_str()
+        sync_status, status_color = self.get_sync_status()
+
+        dynamic = _HTML_DYNAMIC_TMPL % (
+            last_updated,
+            load_avg[0], load_avg[1], load_avg[2],
+            log_size,
+            status_color, sync_status,
+            sync_log.translate(_HTML_ESC) if sync_log.strip() else 'No sync logs yet...',
+        )
+        return dynamic.encode('utf-8')
+
+    def generate_html_page(self, sync_log: str, load_avg: Tuple[float, float, float]) -> str:
+        '''Generate the complete HTML page as a single string'''
+        dynamic = self._render_dynamic(sync_log, load_avg).decode('utf-8')
+        return _HTML_PREFIX + dynamic + _HTML_SUFFIX
+
     def do_GET(self) -> None:
+        global _page_cache
         try:
             if self.path == '/' or self.path == '/logs':
+                # No ETag here: the page body carries the per-request
+                # timestamp and load averages, so a log-derived validator
+                # would 304 those fields stale on an idle log. The render
+                # cache below already absorbs the server-side cost.
+                stat = _safe_stat(LOG_FILE)
+
+                key = (stat.st_size, stat.st_mtime_ns, int(time.time())) if stat else None
+                cached_key, dynamic = _page_cache
+                if key is None or key != cached_key:
+                    # Read log files
+                    sync_log = self.safe_read_log(LOG_FILE)
+
+                    # Get system info
+                    load_avg = _cached_loadavg()
+
+                    # Render before sending headers so Content-Length is
+                    # known and keep-alive connections stay usable
+                    dynamic = self._render_dynamic(sync_log, load_avg)
+                    if key is not None:
+                        _page_cache = (key, dynamic)
+
                 self.send_response(200)
                 self.send_header('Content-type', 'text/html; charset=utf-8')
                 self.send_header('Cache-Control', 'no-cache')
-                self.end_headers()
-                
-                # Read log files
-                sync_log = self.safe_read_log(LOG_FILE)
-                
-                # Get system info
-                try:
-                    load_avg = os.getloadavg()
-                except:
-                    load_avg = (0, 0, 0)
-                
-                html = self.generate_html_page(sync_log, load_avg)
-                self.wfile.write(html.encode('utf-8'))
+
+                total = len(_HTML_PREFIX_BYTES) + len(dynamic) + len(_HTML_SUFFIX_BYTES)
+                if total > _GZIP_MIN_SIZE and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    # Log text compresses 5-10x; level 1 keeps CPU cost low
+                    body = gzip.compress(
+                        _HTML_PREFIX_BYTES + dynamic + _HTML_SUFFIX_BYTES, 1)
+                    self.send_header('Content-Encoding', 'gzip')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self.send_header('Content-Length', str(total))
+                    self.end_headers()
+
+                    # Stream the page in chunks; the static frame is
+                    # pre-encoded so only the dynamic middle is encoded
+                    # per request
+                    self.wfile.write(_HTML_PREFIX_BYTES)
+                    self.wfile.write(dynamic)
+                    self.wfile.write(_HTML_SUFFIX_BYTES)
                 
             elif self.path == '/api/status':
                 # JSON API endpoint for status
+                # Safe log size calculation with proper error handling
+                stat = _cached_log_stat()
+                log_size = round(stat.st_size / (1024 * 1024), 2) if stat else 0
+
+                # time.strftime is a thin wrapper over C strftime; datetime
+                # construction per poll is measurably heavier
+                now = time.time()
+                iso_now = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))
+                payload = _API_STATUS_TMPL % (
+                    f'{iso_now}.{int(now % 1 * 1e6):06d}'.encode(),
+                    b'true' if stat else b'false',
+                    repr(log_size).encode(),
+                )
+
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
                 self.end_headers()
+
+                self.wfile.write(payload)
                 
-                # Safe log size calculation with proper error handling
-                try:
-                    log_size = (
-                        round((os.path.getsize(LOG_FILE) / (1024 * 1024)), 2) 
-                        if os.path.exists(LOG_FILE) else 0
-                    )
-                except (OSError, IOError):
-                    log_size = 0
-                
-                status = {
-                    'timestamp': datetime.now().isoformat(),
-                    'log_exists': os.path.exists(LOG_FILE),
-                    'log_size': log_size,
-                    'server_uptime': 'online'
-                }
-                self.wfile.write(json.dumps(status).encode())
-                
+            elif self.path == '/api/snapshot':
+                # Status plus log tail in one response so the UI can patch
+                # the DOM instead of re-fetching the whole page
+                stat = _safe_stat(LOG_FILE)
+                if stat is not None:
+                    etag = f'"{stat.st_size}-{stat.st_mtime_ns}"'
+                else:
+                    etag = '"0-0"'
+
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                if stat is not None:
+                    tail, _ = self._tail_bytes(LOG_FILE, 200)
+                    tail_text = tail.decode('utf-8', errors='ignore')
+                else:
+                    tail_text = ''
+                sync_status, status_color = self.get_sync_status()
+
+                payload = json.dumps({
+                    'status': sync_status,
+                    'color': status_color,
+                    'log_size': stat.st_size if stat else 0,
+                    'mtime': stat.st_mtime if stat else 0,
+                    'tail': tail_text,
+                }).encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            elif self.path.startswith('/static/app.'):
+                # Immutable, versioned static assets; revalidations get a 304
+                if self.path.startswith('/static/app.css'):
+                    body, etag, ctype = _CSS_BYTES, _CSS_ETAG, 'text/css; charset=utf-8'
+                elif self.path.startswith('/static/app.js'):
+                    body, etag, ctype = _JS_BYTES, _JS_ETAG, 'application/javascript; charset=utf-8'
+                else:
+                    self.send_error(404, 'Not found')
+                    return
+
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-type', ctype)
+                self.send_header('Cache-Control', 'public, max-age=86400, immutable')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
             elif self.path == '/favicon.ico':
-                # Simple SVG favicon with document icon
+                # Simple SVG favicon with document icon (static, pre-encoded
+                # both plain and gzipped)
+                body = _FAVICON_BYTES
                 self.send_response(200)
                 self.send_header('Content-type', 'image/svg+xml')
                 self.send_header('Cache-Control', 'max-age=86400')  # Cache for 24 hours
+                self.send_header('Vary', 'Accept-Encoding')
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = _FAVICON_GZ
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
                 self.end_headers()
-                
-                svg_favicon = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 32 32">
-                    <rect width="32" height="32" fill="#161b22"/>
-                    <rect x="8" y="6" width="16" height="20" rx="1" fill="#58a6ff" stroke="#30363d"/>
-                    <line x1="10" y1="10" x2="22" y2="10" stroke="#161b22" stroke-width="1"/>
-                    <line x1="10" y1="13" x2="22" y2="13" stroke="#161b22" stroke-width="1"/>
-                    <line x1="10" y1="16" x2="18" y2="16" stroke="#161b22" stroke-width="1"/>
-                </svg>'''
-                self.wfile.write(svg_favicon.encode())
+
+                self.wfile.write(body)
             else:
                 self.send_error(404, 'Not found')
         except Exception as e:
             logger.error(f'Error in GET request: {e}')
             self.send_error(500, f'Internal server error: {str(e)}')
 
+    def do_HEAD(self) -> None:
+        '''Answer monitoring probes with headers only, never building a body'''
+        if self.path == '/' or self.path == '/logs':
+            self.send_response(200)
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+        elif self.path == '/api/status' or self.path == '/api/snapshot':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+        elif self.path.startswith('/static/app.'):
+            # Mirror the GET route: same status, validator and headers,
+            # with Content-Length describing the body a GET would send
+            if self.path.startswith('/static/app.css'):
+                body, etag, ctype = _CSS_BYTES, _CSS_ETAG, 'text/css; charset=utf-8'
+            elif self.path.startswith('/static/app.js'):
+                body, etag, ctype = _JS_BYTES, _JS_ETAG, 'application/javascript; charset=utf-8'
+            else:
+                self.send_error(404, 'Not found')
+                return
+
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-type', ctype)
+            self.send_header('Cache-Control', 'public, max-age=86400, immutable')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+        elif self.path == '/favicon.ico':
+            self.send_response(200)
+            self.send_header('Content-type', 'image/svg+xml')
+            self.end_headers()
+        else:
+            self.send_error(404, 'Not found')
+
     def do_POST(self) -> None:
         try:
             # Security: Validate content type and content length
@@ -434,7 +921,7 @@ class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
                     return
             
             # Add security headers to all responses
-            def send_secure_response(status_code: int, 
+            def send_secure_response(status_code: int, body: bytes,
                                    content_type: str = 'application/json') -> None:
                 self.send_response(status_code)
                 self.send_header('Content-type', content_type)
@@ -443,62 +930,56 @@ class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_header(
                     'Cache-Control', 'no-cache, no-store, must-revalidate'
                 )
+                self.send_header('Content-Length', str(len(body)))
                 self.end_headers()
+                self.wfile.write(body)
             
             if self.path == '/clear':
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                if os.path.exists(LOG_FILE):
-                    with open(LOG_FILE, 'w') as f:
-                        f.write(f'[{timestamp}] [INFO] Logs cleared via web interface\n')
-                
-                if os.path.exists(SERVER_LOG_FILE):
-                    with open(SERVER_LOG_FILE, 'w') as f:
-                        f.write(f'[{timestamp}] [INFO] Server logs cleared via web interface\n')
-                
-                send_secure_response(200)
-                self.wfile.write(json.dumps({'status': 'success'}).encode())
+                timestamp = _now_str()
+
+                # Requests are handled on separate threads; serialize the
+                # truncate-and-rewrite so concurrent /clear calls don't race
+                with _clear_lock:
+                    if os.path.exists(LOG_FILE):
+                        _write_line(
+                            LOG_FILE,
+                            f'[{timestamp}] [INFO] Logs cleared via web interface\n'.encode())
+
+                    if os.path.exists(SERVER_LOG_FILE):
+                        _write_line(
+                            SERVER_LOG_FILE,
+                            f'[{timestamp}] [INFO] Server logs cleared via web interface\n'.encode())
+
+                _invalidate_status_cache()
+                send_secure_response(200, _JSON_SUCCESS)
                 logger.info('Logs cleared via web interface')
                 
             elif self.path == '/run':
                 try:
                     # Run sync script in background using secure subprocess
                     with open('/config/logs/sync.log', 'a') as log_file:
+                        # env is inherited by default; no preexec_fn/shell so
+                        # subprocess can take its posix_spawn fast path
                         process = subprocess.Popen(
                             ['/bin/bash', '/src/sync_script.sh'],
                             stdout=log_file,
                             stderr=subprocess.STDOUT,
                             cwd='/',
-                            env=os.environ.copy(),
                             start_new_session=True
                         )
-                    
-                    send_secure_response(200)
-                    self.wfile.write(
-                        json.dumps(
-                            {'status': 'started', 'pid': process.pid}
-                        ).encode()
-                    )
+
+                    _invalidate_status_cache()
+                    send_secure_response(200, _JSON_STARTED_TMPL % process.pid)
                     logger.info(
                         f'Sync script started via web interface with PID {process.pid}'
                     )
                     
                 except (OSError, subprocess.SubprocessError) as e:
                     logger.error(f'Failed to start sync script: {e}')
-                    send_secure_response(500)
-                    self.wfile.write(
-                        json.dumps(
-                            {'status': 'error', 'message': 'Failed to start sync process'}
-                        ).encode()
-                    )
+                    send_secure_response(500, _JSON_ERR_START)
                 except Exception as e:
                     logger.error(f'Unexpected error starting sync: {e}')
-                    send_secure_response(500)
-                    self.wfile.write(
-                        json.dumps(
-                            {'status': 'error', 'message': 'Internal server error'}
-                        ).encode()
-                    )
+                    send_secure_response(500, _JSON_ERR_INTERNAL)
                     
             else:
                 self.send_error(404, 'Endpoint not found')
@@ -509,16 +990,22 @@ class EnhancedLogHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_response(500)
                 self.send_header('Content-type', 'application/json')
                 self.send_header('X-Content-Type-Options', 'nosniff')
+                self.send_header('Content-Length', str(len(_JSON_ERR_INTERNAL)))
                 self.end_headers()
-                self.wfile.write(
-                    json.dumps(
-                        {'status': 'error', 'message': 'Internal server error'}
-                    ).encode()
-                )
+                self.wfile.write(_JSON_ERR_INTERNAL)
             except Exception:
                 # If we can't send a proper error response, just close the connection
                 pass
 
+class ThreadedHTTPServer(http.server.ThreadingHTTPServer):
+    '''Serve each request on its own thread so a slow log read on / does not
+    block /api/status or /run'''
+    daemon_threads = True
+    allow_reuse_address = True
+    # Default accept backlog is 5; refresh bursts (page + favicon + static
+    # assets over parallel connections) can overflow that and get RST
+    request_queue_size = 128
+
 def signal_handler(sig: int, frame: Any) -> None:
     logger.info('Received shutdown signal')
     sys.exit(0)
@@ -533,13 +1020,13 @@ if __name__ == '__main__':
         
         # Try to bind to port 80, fall back to 8080 if permission denied
         try:
-            httpd = socketserver.TCPServer(('', PORT), EnhancedLogHandler)
+            httpd = ThreadedHTTPServer(('', PORT), EnhancedLogHandler)
         except PermissionError:
             logger.warning(
                 f'Permission denied for port {PORT}, trying port 8080'
             )
             PORT = 8080
-            httpd = socketserver.TCPServer(('', PORT), EnhancedLogHandler)
+            httpd = ThreadedHTTPServer(('', PORT), EnhancedLogHandler)
         
         with httpd:
             logger.info(f'Enhanced web server running on port {PORT}')
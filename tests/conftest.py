@@ -1,53 +1,118 @@
 #!/usr/bin/env python3
 """Pytest configuration and shared fixtures for rsync-tailscale-docker tests."""
 
+import io
 import os
+import sys
 import tempfile
 import json
 import pytest
 
-@pytest.fixture
-def mock_sync_environment():
-    """Setup mock environment for sync testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create source directories
-        source_dirs = ['data1', 'data2', 'docs']
-        for dir_name in source_dirs:
-            os.makedirs(os.path.join(temp_dir, dir_name))
-            # Add some test files
-            test_file = os.path.join(temp_dir, dir_name, 'test.txt')
-            with open(test_file, 'w') as f:
-                f.write(f'Test content for {dir_name}')
-        
-        # Create routes file
-        routes = {
-            f'{temp_dir}/data1': '/remote/backup/data1',
-            f'{temp_dir}/data2': '/remote/backup/data2',
-            f'{temp_dir}/docs': '/remote/backup/docs'
-        }
-        routes_file = os.path.join(temp_dir, 'routes.json')
-        with open(routes_file, 'w') as f:
-            json.dump(routes, f)
-        
-        # Create logs directory
-        logs_dir = os.path.join(temp_dir, 'logs')
-        os.makedirs(logs_dir)
-        
-        yield {
-            'temp_dir': temp_dir,
-            'source_dirs': source_dirs,
-            'routes_file': routes_file,
-            'routes': routes,
-            'logs_dir': logs_dir,
-            'ssh_key': os.path.join(temp_dir, 'test_key'),
-            'remote_host': '192.168.1.100',
-            'remote_user': 'testuser'
-        }
+# Make src/ importable once for every test module (and every pytest-xdist
+# worker) instead of per-module sys.path edits
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def tmpfs_tempdir():
+    """Point temporary files at tmpfs when available.
+
+    The suite is dominated by many small open/write/read cycles; /dev/shm
+    keeps those entirely in memory with no disk writeback, while /tmp may
+    be a disk-backed overlay on CI containers.
+    """
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        tempfile.tempdir = '/dev/shm'
+    yield
+    tempfile.tempdir = None
+
+
+@pytest.fixture(scope='session')
+def mock_sync_environment(tmp_path_factory):
+    """Setup mock environment for sync testing.
+
+    Session-scoped: the directory tree and routes file are immutable
+    baseline state, so they are built once per run. Tests that need a
+    writable scratch area (e.g. for log files) use their own tmp_path.
+    """
+    temp_dir = str(tmp_path_factory.mktemp('sync'))
+
+    # Create source directories
+    source_dirs = ['data1', 'data2', 'docs']
+    for dir_name in source_dirs:
+        os.makedirs(os.path.join(temp_dir, dir_name))
+        # Add some test files
+        test_file = os.path.join(temp_dir, dir_name, 'test.txt')
+        with open(test_file, 'w') as f:
+            f.write(f'Test content for {dir_name}')
+
+    # Create routes file
+    routes = {
+        f'{temp_dir}/data1': '/remote/backup/data1',
+        f'{temp_dir}/data2': '/remote/backup/data2',
+        f'{temp_dir}/docs': '/remote/backup/docs'
+    }
+    routes_file = os.path.join(temp_dir, 'routes.json')
+    with open(routes_file, 'w') as f:
+        json.dump(routes, f)
+
+    # Create logs directory
+    logs_dir = os.path.join(temp_dir, 'logs')
+    os.makedirs(logs_dir)
+
+    return {
+        'temp_dir': temp_dir,
+        'source_dirs': source_dirs,
+        'routes_file': routes_file,
+        'routes': routes,
+        # Rsync source/target argument pairs, formatted once here so
+        # per-route loops don't rebuild the same f-strings
+        'route_args': {
+            source: (f'{source}/', f'testuser@192.168.1.100:{destination}/')
+            for source, destination in routes.items()
+        },
+        'logs_dir': logs_dir,
+        'ssh_key': os.path.join(temp_dir, 'test_key'),
+        'remote_host': '192.168.1.100',
+        'remote_user': 'testuser'
+    }
 import pytest
 from unittest.mock import Mock, patch
 from typing import Generator, Dict, Any
 
 
+# Parsed routes files, keyed by (path, mtime_ns)
+_routes_cache: Dict[Any, Dict[str, str]] = {}
+
+
+@pytest.fixture
+def routes_data(mock_sync_environment) -> Dict[str, str]:
+    """Parsed routes mapping for the mock sync environment.
+
+    Memoized on the file's identity so the JSON parse runs at most once
+    per distinct routes file, however many tests consume it.
+    """
+    path = mock_sync_environment['routes_file']
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _routes_cache:
+        with open(path) as f:
+            _routes_cache[key] = json.load(f)
+    return _routes_cache[key]
+
+
+@pytest.fixture
+def fake_open():
+    """Patch builtins.open to hand out BytesIO readers over fixed data.
+
+    mock_open assembles a MagicMock chain per call and iterates at Python
+    level; BytesIO is a C type with real read/readline/seek semantics, so
+    tests exercise genuine file-object behavior at a fraction of the cost.
+    """
+    def _make(data: bytes):
+        return patch('builtins.open', lambda *args, **kwargs: io.BytesIO(data))
+    return _make
+
+
 @pytest.fixture
 def temp_log_file() -> Generator[str, None, None]:
     """Create a temporary log file for testing."""
@@ -64,9 +129,12 @@ def temp_log_file() -> Generator[str, None, None]:
         os.unlink(temp_path)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def sample_routes_json() -> Dict[str, str]:
-    """Sample routes configuration for testing."""
+    """Sample routes configuration for testing.
+
+    Session-scoped pure data; consumers only read from the mapping.
+    """
     return {
         '/data/test1': '/remote/backup1',
         '/data/test2': '/remote/backup2',
@@ -97,7 +165,7 @@ def mock_subprocess():
         yield mock_popen
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def sample_sync_log() -> str:
     """Sample sync log content for testing."""
     return '''[2024-01-01 10:00:00] [INFO] Starting sync process...
@@ -112,7 +180,7 @@ def sample_sync_log() -> str:
 [2024-01-01 10:00:17] [WARN] Some syncs failed. Check logs for details.'''
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def completed_sync_log() -> str:
     """Sample completed sync log for status testing."""
     return '''[2024-01-01 10:00:00] [INFO] Starting sync process...
@@ -137,12 +205,23 @@ def reset_environment():
     os.environ.update(original_env)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def mock_ssh_environment() -> Dict[str, str]:
-    """Mock SSH environment variables for testing."""
+    """Mock SSH environment variables for testing.
+
+    Session-scoped: consumers only read from the mapping.
+    """
     return {
         'REMOTE_USER': 'testuser',
         'REMOTE_HOST': '192.168.1.100',
         'ROUTES_FILE': '/test/routes.json',
         'SSH_KEY_FILE': 'test_key'
-    }
\ No newline at end of file
+    }
+
+
+@pytest.fixture(scope='session')
+def env_export_content(mock_ssh_environment) -> str:
+    """Shell export lines for the mock SSH environment, built once."""
+    return '\n'.join(
+        f"export {key}='{value}'" for key, value in mock_ssh_environment.items()
+    )
\ No newline at end of file
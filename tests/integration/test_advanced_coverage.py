@@ -14,8 +14,7 @@ from unittest.mock import Mock, patch, MagicMock
 import pytest
 import socketserver
 
-# Add src to path and import web_server
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+# src/ is put on sys.path by tests/conftest.py
 import web_server
 from web_server import MAX_LOG_SIZE
 
@@ -2,24 +2,150 @@
 """Integration tests for the complete sync process workflow."""
 
 import pytest
+import re
+import stat
 import subprocess
-import tempfile
+import sys
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntFlag
 from unittest.mock import patch, Mock, call
 
 
+class _Step(IntFlag):
+    """Workflow milestones for test_complete_sync_workflow."""
+    ENV_VALIDATED = 1
+    SSH_OK = 2
+    SYNC_DONE = 4
+    SYNC_FAILED = 8
+    COMPLETED = 16
+
+
+# The five log markers test_log_file_output expects, matched in a single
+# sweep instead of five separate substring scans
+_LOG_MARKERS_RX = re.compile(
+    rb'Starting sync process|SSH connection successful|Sync completed|'
+    rb'Sync failed|Some syncs failed\. Check logs for details\.'
+)
+
+# Simulated sync log for test_log_file_output, encoded once at import
+_SYNC_LOG_BLOB = '\n'.join([
+    '[2024-01-01 10:00:00] [INFO] Starting sync process...',
+    '[2024-01-01 10:00:01] [INFO] Processing 3 backup route(s)',
+    '[2024-01-01 10:00:02] [INFO] Testing SSH connection to testuser@192.168.1.100',
+    '[2024-01-01 10:00:03] [INFO] SSH connection successful',
+    '[2024-01-01 10:00:04] [INFO] Starting sync: /data1 -> /remote/backup/data1',
+    '[2024-01-01 10:00:30] [SUCCESS] Sync completed: /data1 -> /remote/backup/data1 (26s)',
+    '[2024-01-01 10:00:31] [INFO] Starting sync: /data2 -> /remote/backup/data2',
+    '[2024-01-01 10:01:00] [ERROR] Sync failed: /data2 -> /remote/backup/data2 (exit code: 1, duration: 29s)',
+    '[2024-01-01 10:01:01] [INFO] Sync process completed - Success: 1, Failures: 1, Total Duration: 61s',
+    '[2024-01-01 10:01:02] [WARN] Some syncs failed. Check logs for details.'
+]).encode()
+
+# Shared command-line fragments, interned so repeated comparisons in
+# the mock dispatch and assertions reduce to pointer checks and every
+# parametrized case references the same string objects
+_HOST = sys.intern('testuser@192.168.1.100')
+_SSH_OPTS = sys.intern(
+    'ssh -i /.ssh/id_rsa -o BatchMode=yes -o ConnectTimeout=10'
+    ' -o ServerAliveInterval=60 -o StrictHostKeyChecking=no'
+    ' -o UserKnownHostsFile=/dev/null'
+)
+_EXCLUDES = tuple(sys.intern(f'--exclude={pattern}') for pattern in (
+    '*.Trash*',
+    'lost+found',
+    'System Volume Information',
+    '.DS_Store',
+    'Thumbs.db',
+    'desktop.ini',
+    'sync.log',
+    '.venv',
+))
+
+# Invariant rsync argument prefix; only the source/target pair varies
+# per route
+_RSYNC_PREFIX = (
+    ('rsync', '-avzP', '--stats', '--timeout=3600')
+    + _EXCLUDES
+    + ('-e', _SSH_OPTS)
+)
+
+
+# The per-route tests parametrize over route positions: the actual route
+# paths live under the session temp dir and don't exist at collection
+# time, but the fixture always builds exactly three routes
+_ROUTE_INDICES = range(3)
+
+# Canned subprocess results for the workflow test, built once
+_SSH_OK = Mock(returncode=0, stdout='Connection OK\n', stderr='')
+_RSYNC_OK = Mock(
+    returncode=0,
+    stdout='sent 1,234 bytes  received 56 bytes\ntotal size is 1,234\n',
+    stderr=''
+)
+_EMPTY_OK = Mock(returncode=0, stdout='', stderr='')
+
+# Bytes variants for the tests that leave pipe output undecoded
+_RSYNC_OK_BYTES = Mock(
+    returncode=0,
+    stdout=b'sent 1,234 bytes  received 56 bytes\ntotal size is 1,234',
+    stderr=b''
+)
+_RSYNC_FAIL_BYTES = Mock(
+    returncode=1,
+    stdout=b'',
+    stderr=b'rsync: failed to connect to server\n'
+)
+
+
+def _mock_command_response(command, *args, **kwargs):
+    """Dispatch on argv[0] instead of joining and scanning the whole
+    command string on every call."""
+    prog = command[0] if isinstance(command, (list, tuple)) else str(command).split(None, 1)[0]
+    if prog == 'ssh' and command[-1].startswith('echo'):
+        # SSH connection test
+        return _SSH_OK
+    if prog == 'rsync':
+        return _RSYNC_OK
+    return _EMPTY_OK
+
+
+def _iter_files(path):
+    """Yield non-directory scandir entries under path, depth-first.
+
+    scandir entries carry the stat from readdir, so callers pay one stat
+    per file at most (os.walk plus os.path.getsize would stat twice).
+    """
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry
+                except OSError:
+                    pass
+
+
+def _dir_size(path):
+    """Total size of the files under path.
+
+    The sum over a generator keeps the accumulation loop in C and the
+    traversal reusable for callers that want the entries themselves.
+    """
+    return sum(e.stat(follow_symlinks=False).st_size for e in _iter_files(path))
+
+
 class TestSyncProcessWorkflow:
     """Test the complete sync process from start to finish."""
     
-    def test_routes_file_validation(self, mock_sync_environment):
+    def test_routes_file_validation(self, routes_data):
         """Test routes file validation and parsing."""
-        routes_file = mock_sync_environment['routes_file']
-        
-        # Should be valid JSON
-        with open(routes_file, 'r') as f:
-            routes_data = json.load(f)
-        
+        # The fixture parses (and memoizes) the JSON; reaching here means
+        # the file was valid
         assert isinstance(routes_data, dict), 'Routes should be a dictionary'
         assert len(routes_data) > 0, 'Routes should not be empty'
         
@@ -28,25 +154,23 @@ class TestSyncProcessWorkflow:
             assert source.startswith('/'), f'Source path {source} should be absolute'
             assert destination.startswith('/'), f'Destination path {destination} should be absolute'
     
-    def test_source_directory_validation(self, mock_sync_environment):
+    @pytest.mark.parametrize('route_index', _ROUTE_INDICES)
+    def test_source_directory_validation(self, mock_sync_environment, route_index):
         """Test validation of source directories."""
-        routes = mock_sync_environment['routes']
-        
-        for source_path in routes.keys():
-            # Source directory should exist
-            assert os.path.exists(source_path), f'Source directory {source_path} should exist'
-            assert os.path.isdir(source_path), f'Source {source_path} should be a directory'
-            assert os.access(source_path, os.R_OK), f'Source {source_path} should be readable'
+        source_path = list(mock_sync_environment['routes'])[route_index]
+
+        # One stat answers existence and file type; exists/isdir would
+        # each issue their own. A failed stat raises, which pytest
+        # reports just as clearly as the old exists assertion.
+        st = os.stat(source_path)
+        assert stat.S_ISDIR(st.st_mode), f'Source {source_path} should be a directory'
+        assert os.access(source_path, os.R_OK), f'Source {source_path} should be readable'
     
     @patch('subprocess.run')
     def test_ssh_connectivity_test(self, mock_subprocess, mock_sync_environment):
         """Test SSH connectivity testing phase."""
-        # Mock successful SSH connection
-        mock_subprocess.return_value = Mock(
-            returncode=0,
-            stdout='Connection OK\n',
-            stderr=''
-        )
+        # Mock successful SSH connection (shared module-level result)
+        mock_subprocess.return_value = _SSH_OK
         
         # Simulate SSH connection test
         ssh_command = [
@@ -57,7 +181,7 @@ class TestSyncProcessWorkflow:
             '-o', 'StrictHostKeyChecking=no',
             '-o', 'UserKnownHostsFile=/dev/null',
             '-v',
-            'testuser@192.168.1.100',
+            _HOST,
             'echo "Connection OK"'
         ]
         
@@ -67,61 +191,45 @@ class TestSyncProcessWorkflow:
         assert result.returncode == 0, 'SSH connection test should succeed'
         assert 'Connection OK' in result.stdout, 'Should receive connection confirmation'
     
+    @pytest.mark.parametrize('route_index', _ROUTE_INDICES)
     @patch('subprocess.run')
-    def test_rsync_command_execution(self, mock_subprocess, mock_sync_environment):
-        """Test rsync command execution for each route."""
-        routes = mock_sync_environment['routes']
-        
-        # Mock successful rsync execution
-        mock_subprocess.return_value = Mock(
-            returncode=0,
-            stdout='sent 1,234 bytes  received 56 bytes\ntotal size is 1,234',
-            stderr=''
-        )
-        
-        for source, destination in routes.items():
-            # Construct expected rsync command
-            rsync_command = [
-                'rsync', '-avzP', '--stats', '--timeout=3600',
-                '--exclude=*.Trash*',
-                '--exclude=lost+found', 
-                '--exclude=System Volume Information',
-                '--exclude=.DS_Store',
-                '--exclude=Thumbs.db',
-                '--exclude=desktop.ini',
-                '--exclude=sync.log',
-                '--exclude=.venv',
-                '-e', 'ssh -i /.ssh/id_rsa -o BatchMode=yes -o ConnectTimeout=10 -o ServerAliveInterval=60 -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null',
-                f'{source}/',
-                f'testuser@192.168.1.100:{destination}/'
-            ]
-            
-            result = subprocess.run(rsync_command, capture_output=True, text=True)
-            
-            # Should succeed
-            assert result.returncode == 0, f'Rsync should succeed for {source} -> {destination}'
-            assert 'sent' in result.stdout, 'Should show transfer statistics'
+    def test_rsync_command_execution(self, mock_subprocess, mock_sync_environment, route_index):
+        """Test rsync command execution for one route."""
+        # Mock successful rsync execution; bytes output, matching the
+        # undecoded pipes below
+        mock_subprocess.return_value = _RSYNC_OK_BYTES
+
+        # Endpoint argument pair comes preformatted from the fixture;
+        # only the invariant prefix is added here
+        src_arg, dst_arg = list(mock_sync_environment['route_args'].values())[route_index]
+        rsync_command = _RSYNC_PREFIX + (src_arg, dst_arg)
+
+        # No text=True: the assertions only look for ASCII substrings,
+        # so decoding the stats buffer is wasted work
+        result = subprocess.run(rsync_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # Should succeed
+        assert result.returncode == 0, f'Rsync should succeed for {src_arg} -> {dst_arg}'
+        assert b'sent' in result.stdout, 'Should show transfer statistics'
     
     @patch('subprocess.run')
     def test_rsync_failure_handling(self, mock_subprocess, mock_sync_environment):
         """Test handling of rsync failures."""
         # Mock rsync failure
-        mock_subprocess.return_value = Mock(
-            returncode=1,
-            stdout='',
-            stderr='rsync: failed to connect to server\n'
-        )
-        
-        source = list(mock_sync_environment['routes'].keys())[0]
-        destination = list(mock_sync_environment['routes'].values())[0]
-        
-        rsync_command = ['rsync', '-avzP', f'{source}/', f'testuser@192.168.1.100:{destination}/']
-        
-        result = subprocess.run(rsync_command, capture_output=True, text=True)
-        
+        mock_subprocess.return_value = _RSYNC_FAIL_BYTES
+
+        # First route without materializing full key/value lists
+        routes = mock_sync_environment['routes']
+        source = next(iter(routes))
+        destination = routes[source]
+
+        rsync_command = ['rsync', '-avzP', f'{source}/', f'{_HOST}:{destination}/']
+
+        result = subprocess.run(rsync_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
         # Should fail
         assert result.returncode != 0, 'Rsync should fail in this test'
-        assert 'failed to connect' in result.stderr, 'Should capture error message'
+        assert b'failed to connect' in result.stderr, 'Should capture error message'
     
     def test_sync_statistics_tracking(self, mock_sync_environment):
         """Test sync statistics collection and reporting."""
@@ -153,68 +261,57 @@ class TestSyncProcessWorkflow:
         assert sync_stats['successful_syncs'] + sync_stats['failed_syncs'] == sync_stats['total_routes']
         assert sync_stats['total_duration'] > 0, 'Should track duration'
     
-    def test_log_file_output(self, mock_sync_environment):
+    def test_log_file_output(self, tmp_path):
         """Test log file creation and content."""
-        logs_dir = mock_sync_environment['logs_dir']
-        sync_log = os.path.join(logs_dir, 'sync.log')
-        
-        # Simulate log file creation
-        log_entries = [
-            '[2024-01-01 10:00:00] [INFO] Starting sync process...',
-            '[2024-01-01 10:00:01] [INFO] Processing 3 backup route(s)',
-            '[2024-01-01 10:00:02] [INFO] Testing SSH connection to testuser@192.168.1.100',
-            '[2024-01-01 10:00:03] [INFO] SSH connection successful',
-            '[2024-01-01 10:00:04] [INFO] Starting sync: /data1 -> /remote/backup/data1',
-            '[2024-01-01 10:00:30] [SUCCESS] Sync completed: /data1 -> /remote/backup/data1 (26s)',
-            '[2024-01-01 10:00:31] [INFO] Starting sync: /data2 -> /remote/backup/data2',
-            '[2024-01-01 10:01:00] [ERROR] Sync failed: /data2 -> /remote/backup/data2 (exit code: 1, duration: 29s)',
-            '[2024-01-01 10:01:01] [INFO] Sync process completed - Success: 1, Failures: 1, Total Duration: 61s',
-            '[2024-01-01 10:01:02] [WARN] Some syncs failed. Check logs for details.'
-        ]
-        
-        with open(sync_log, 'w') as f:
-            f.write('\n'.join(log_entries))
-        
+        # Writes scratch state, so it uses its own tmp_path rather than
+        # the shared session environment
+        sync_log = tmp_path / 'sync.log'
+
+        # Simulate log file creation; the blob is joined and encoded once
+        # at module load, and write_bytes/read_bytes skip the
+        # TextIOWrapper layer entirely
+        sync_log.write_bytes(_SYNC_LOG_BLOB)
+
         # Validate log content
-        assert os.path.exists(sync_log), 'Sync log file should be created'
-        
-        with open(sync_log, 'r') as f:
-            log_content = f.read()
-        
-        # Should contain all expected log entries
-        assert 'Starting sync process' in log_content
-        assert 'SSH connection successful' in log_content
-        assert 'Sync completed' in log_content
-        assert 'Sync failed' in log_content
-        assert 'Some syncs failed. Check logs for details.' in log_content
+        assert sync_log.is_file(), 'Sync log file should be created'
+
+        log_content = sync_log.read_bytes()
+
+        # One compiled-alternation sweep finds every expected marker
+        # instead of five separate substring scans over the buffer
+        markers_found = set(_LOG_MARKERS_RX.findall(log_content))
+        assert len(markers_found) == 5, \
+               f'Log should contain all expected entries, found {markers_found}'
     
-    def test_file_locking_mechanism(self):
+    def test_file_locking_mechanism(self, tmp_path):
         """Test file locking to prevent concurrent syncs."""
         import fcntl
-        
-        with tempfile.NamedTemporaryFile(mode='w+') as lock_file:
+
+        lock_path = str(tmp_path / 'sync.lock')
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+        try:
             # Simulate acquiring lock
-            try:
-                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                lock_acquired = True
-            except (IOError, OSError):
-                lock_acquired = False
-            
-            assert lock_acquired, 'Should be able to acquire lock initially'
-            
-            # Try to acquire lock again (should fail)
-            with tempfile.NamedTemporaryFile(mode='w+') as second_lock:
-                try:
-                    # This simulates what would happen if another process tried to lock the same file
-                    # In reality, this would use the same file path
-                    fcntl.flock(second_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    second_lock_acquired = True
-                except (IOError, OSError):
-                    second_lock_acquired = False
-                
-                # Since we're using different files, this won't actually test the locking
-                # But it verifies the mechanism works
-                assert isinstance(second_lock_acquired, bool), 'Lock acquisition should return boolean'
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            # A second process contending on the *same* path must be
+            # refused; posix_spawn avoids the full fork of this process
+            child_code = (
+                'import fcntl, os, sys\n'
+                f'fd = os.open({lock_path!r}, os.O_RDWR)\n'
+                'try:\n'
+                '    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)\n'
+                'except OSError:\n'
+                '    sys.exit(1)\n'
+                'sys.exit(0)\n'
+            )
+            pid = os.posix_spawn(
+                sys.executable, [sys.executable, '-c', child_code], os.environ)
+            _, status = os.waitpid(pid, 0)
+
+            assert os.WEXITSTATUS(status) == 1, \
+                   'Second process should be refused the held lock'
+        finally:
+            os.close(fd)
 
 
 class TestSyncProcessIntegration:
@@ -225,66 +322,45 @@ class TestSyncProcessIntegration:
         """Test complete sync workflow integration."""
         routes = mock_sync_environment['routes']
         
-        # Setup mock responses for different commands
-        def mock_command_response(command, *args, **kwargs):
-            command_str = ' '.join(command) if isinstance(command, list) else str(command)
-            
-            if 'ssh' in command_str and 'echo' in command_str:
-                # SSH connection test
-                return Mock(returncode=0, stdout='Connection OK\n', stderr='')
-            elif 'rsync' in command_str:
-                # Rsync command
-                return Mock(
-                    returncode=0,
-                    stdout='sent 1,234 bytes  received 56 bytes\ntotal size is 1,234\n',
-                    stderr=''
-                )
-            else:
-                return Mock(returncode=0, stdout='', stderr='')
-        
-        mock_subprocess.side_effect = mock_command_response
-        
-        # Simulate complete workflow
-        workflow_steps = []
+        # Canned responses dispatched per command name
+        mock_subprocess.side_effect = _mock_command_response
         
+        # Simulate complete workflow; milestones are bitmask flags, so
+        # recording and membership checks are O(1) with no string
+        # allocation per route
+
         # 1. Environment validation (simulated)
-        workflow_steps.append('environment_validated')
-        
+        steps_mask = _Step.ENV_VALIDATED
+
         # 2. SSH connection test
-        ssh_result = subprocess.run(['ssh', 'testuser@192.168.1.100', 'echo "OK"'], 
+        ssh_result = subprocess.run(['ssh', _HOST, 'echo "OK"'],
                                   capture_output=True, text=True)
         if ssh_result.returncode == 0:
-            workflow_steps.append('ssh_connection_successful')
-        
-        # 3. Process each route
-        for source, destination in routes.items():
-            rsync_result = subprocess.run(['rsync', '-avzP', f'{source}/', f'testuser@192.168.1.100:{destination}/'],
+            steps_mask |= _Step.SSH_OK
+
+        # 3. Process the routes concurrently; rsync jobs are independent,
+        # so the per-route invocations overlap instead of running serially
+        def _run_route(source, args):
+            rsync_result = subprocess.run(['rsync', '-avzP', *args],
                                         capture_output=True, text=True)
-            if rsync_result.returncode == 0:
-                workflow_steps.append(f'sync_completed_{os.path.basename(source)}')
-            else:
-                workflow_steps.append(f'sync_failed_{os.path.basename(source)}')
-        
+            return _Step.SYNC_DONE if rsync_result.returncode == 0 else _Step.SYNC_FAILED
+
+        route_args = mock_sync_environment['route_args']
+        with ThreadPoolExecutor(max_workers=min(len(routes), 8)) as executor:
+            route_results = list(executor.map(lambda item: _run_route(*item), route_args.items()))
+        for route_result in route_results:
+            steps_mask |= route_result
+
         # 4. Finalization
-        workflow_steps.append('sync_process_completed')
-        
+        steps_mask |= _Step.COMPLETED
+
         # Validate workflow
-        expected_steps = [
-            'environment_validated',
-            'ssh_connection_successful',
-            'sync_completed_data1',
-            'sync_completed_data2', 
-            'sync_completed_docs',
-            'sync_process_completed'
-        ]
-        
-        assert 'environment_validated' in workflow_steps
-        assert 'ssh_connection_successful' in workflow_steps
-        assert 'sync_process_completed' in workflow_steps
-        
+        assert steps_mask & _Step.ENV_VALIDATED
+        assert steps_mask & _Step.SSH_OK
+        assert steps_mask & _Step.COMPLETED
+
         # Should have attempted to sync all routes
-        sync_steps = [step for step in workflow_steps if 'sync_completed_' in step or 'sync_failed_' in step]
-        assert len(sync_steps) == len(routes), f'Should process all {len(routes)} routes'
+        assert len(route_results) == len(routes), f'Should process all {len(routes)} routes'
     
     def test_error_recovery_and_reporting(self, mock_sync_environment):
         """Test error recovery and comprehensive reporting."""
@@ -312,28 +388,34 @@ class TestSyncProcessIntegration:
                 }
             sync_results.append(result)
         
-        # Analyze results
-        successful_syncs = [r for r in sync_results if r['success']]
-        failed_syncs = [r for r in sync_results if not r['success']]
-        total_duration = sum(r['duration'] for r in sync_results)
-        
+        # Analyze results in a single pass instead of three traversals
+        successful = failed = total_duration = 0
+        failures_have_errors = False
+        for r in sync_results:
+            total_duration += r['duration']
+            if r['success']:
+                successful += 1
+            else:
+                failed += 1
+                failures_have_errors = failures_have_errors or bool(r['error'])
+
         # Generate final report
         final_status = {
             'total_routes': len(routes),
-            'successful_syncs': len(successful_syncs),
-            'failed_syncs': len(failed_syncs),
+            'successful_syncs': successful,
+            'failed_syncs': failed,
             'total_duration': total_duration,
-            'overall_success': len(failed_syncs) == 0
+            'overall_success': failed == 0
         }
-        
+
         # Validate error handling
         assert final_status['total_routes'] == len(routes)
         assert final_status['successful_syncs'] + final_status['failed_syncs'] == final_status['total_routes']
         assert final_status['failed_syncs'] > 0, 'Should detect failures in this test'
         assert not final_status['overall_success'], 'Overall sync should be marked as failed'
-        
+
         # Should have error details
-        assert any(r['error'] for r in failed_syncs), 'Failed syncs should have error messages'
+        assert failures_have_errors, 'Failed syncs should have error messages'
     
     def test_performance_monitoring(self, mock_sync_environment):
         """Test performance monitoring and metrics collection."""
@@ -341,48 +423,41 @@ class TestSyncProcessIntegration:
         
         routes = mock_sync_environment['routes']
         
-        # Simulate performance metrics collection
+        # Simulate performance metrics collection; monotonic_ns is the
+        # right clock for durations (no wall-clock jumps, integer math,
+        # no float-allocating realtime read per sample)
+        start_ns = time.monotonic_ns()
         performance_metrics = {
-            'start_time': time.time(),
             'route_timings': [],
             'total_bytes_transferred': 0,
             'average_transfer_rate': 0
         }
-        
-        # Process routes with timing
-        for source, destination in routes.items():
-            route_start = time.time()
-            
-            # Simulate file size calculation
-            route_size = 0
-            for root, dirs, files in os.walk(source):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        route_size += os.path.getsize(file_path)
-                    except OSError:
-                        pass
-            
-            # Simulate sync duration based on file size
-            simulated_duration = max(1, route_size / 1000000)  # 1MB per second
-            time.sleep(0.001)  # Small delay for timing measurement
-            
-            route_end = time.time()
-            actual_duration = route_end - route_start
-            
-            route_timing = {
+
+        # Time the routes concurrently; each measurement is independent
+        def _time_route(source, destination):
+            route_start_ns = time.monotonic_ns()
+
+            # Simulate file size calculation (the real work being timed;
+            # no artificial sleep needed for a nonzero reading)
+            route_size = _dir_size(source)
+
+            actual_duration = (time.monotonic_ns() - route_start_ns) / 1e9
+
+            return {
                 'source': source,
                 'destination': destination,
                 'size_bytes': route_size,
                 'duration_seconds': actual_duration,
                 'transfer_rate_mbps': (route_size / actual_duration) / (1024 * 1024) if actual_duration > 0 else 0
             }
-            
-            performance_metrics['route_timings'].append(route_timing)
-            performance_metrics['total_bytes_transferred'] += route_size
-        
-        performance_metrics['end_time'] = time.time()
-        performance_metrics['total_duration'] = performance_metrics['end_time'] - performance_metrics['start_time']
+
+        with ThreadPoolExecutor(max_workers=min(len(routes), 8)) as executor:
+            timings = list(executor.map(lambda sd: _time_route(*sd), routes.items()))
+
+        performance_metrics['route_timings'] = timings
+        performance_metrics['total_bytes_transferred'] = sum(t['size_bytes'] for t in timings)
+
+        performance_metrics['total_duration'] = (time.monotonic_ns() - start_ns) / 1e9
         
         if performance_metrics['total_duration'] > 0:
             performance_metrics['average_transfer_rate'] = (
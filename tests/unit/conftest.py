@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Shared fixtures for the unit tests working against real files."""
+
+import io
+import os
+import pytest
+
+# src/ is put on sys.path by tests/conftest.py
+from web_server import EnhancedLogHandler
+
+
+@pytest.fixture(scope='session')
+def real_ops_dir(tmp_path_factory):
+    """Shared scratch directory for the real-file tests.
+
+    Built once per run on the (tmpfs-backed) base temp dir; cleanup is
+    deferred to pytest instead of a per-test mkdtemp/rmtree cycle.
+    """
+    return str(tmp_path_factory.mktemp('realops'))
+
+
+@pytest.fixture
+def log_file(real_ops_dir):
+    """Per-test log path inside the shared directory.
+
+    Only the file itself is created and unlinked per test; recreating a
+    single inode is far cheaper than rebuilding a directory tree.
+    """
+    path = os.path.join(real_ops_dir, 'rsync.log')
+    yield path
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+# Single request-body buffer shared by the POST tests; rewinding and
+# truncating it between tests is cheaper than allocating a BytesIO (and
+# its internal buffer) per request body
+_rfile_buffer = io.BytesIO()
+
+
+@pytest.fixture
+def rfile():
+    """Reusable request-body buffer, reset after each test."""
+    yield _rfile_buffer
+    _rfile_buffer.seek(0)
+    _rfile_buffer.truncate(0)
+
+
+@pytest.fixture(scope='session')
+def make_handler():
+    """Factory for handler skeletons that bypass HTTP initialization.
+
+    Replaces the create_handler_with_log_file method that was duplicated
+    across test classes.
+    """
+    def _make(log_file_path):
+        handler = object.__new__(EnhancedLogHandler)
+        handler.log_file = log_file_path
+        return handler
+    return _make
@@ -4,16 +4,76 @@
 import pytest
 import json
 import io
+import itertools
 import os
-import sys
+import tempfile
 from unittest.mock import patch, Mock, mock_open, MagicMock
 from http.server import HTTPServer
 
-# Add src directory to Python path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
+# src/ is put on sys.path by tests/conftest.py
+import web_server
 from web_server import EnhancedLogHandler
 
+# Per-test log paths for the do_GET tests; the paths are never created,
+# so web_server's module-level render cache (keyed on the log's stat)
+# can neither hit nor be populated across tests. Without this isolation
+# a real /config/logs/sync.log on the host warms the cache and the
+# error-path tests never reach their patched readers.
+_log_path_seq = itertools.count()
+
+
+def _fresh_log_path():
+    return os.path.join(
+        tempfile.gettempdir(),
+        f'handler_sync_{os.getpid()}_{next(_log_path_seq)}.log')
+
+
+# Prebuilt POST bodies with their header dicts; the json.dumps/str(len())
+# pair runs once at import instead of inside every test
+_VALID_JSON = b'{"test": "data"}'
+_VALID_JSON_HEADERS = {
+    'Content-Length': str(len(_VALID_JSON)),
+    'Content-Type': 'application/json'
+}
+_INVALID_JSON = b'invalid json data}'
+_INVALID_JSON_HEADERS = {
+    'Content-Length': str(len(_INVALID_JSON)),
+    'Content-Type': 'application/json'
+}
+
+# Single mock_open shared by the /run tests; assembling its MagicMock
+# file-handle chain is the expensive part, resetting recorded calls is not
+_MOCK_OPEN = mock_open()
+
+
+class _Recorder:
+    """Minimal callable double that only records its calls.
+
+    Mock's __call__ runs spec, side-effect and child-mock machinery on
+    every invocation; the response-method doubles below are only ever
+    inspected for the (args, kwargs) they received.
+    """
+
+    __slots__ = ('calls',)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+
+class _TestHandler(EnhancedLogHandler):
+    """Handler double whose __init__ skips the socket handshake.
+
+    BaseHTTPRequestHandler.__init__ wants a live connection; one subclass
+    replaces the patch.object(__init__) context manager every setup_method
+    previously entered and unwound per test.
+    """
+
+    def __init__(self):
+        pass
+
 
 class MockRequest:
     """Mock HTTP request for testing."""
@@ -31,71 +91,76 @@ class TestWebEndpoints:
     
     def setup_method(self):
         """Setup test handler for each test."""
-        # Mock the handler initialization to avoid HTTP server requirements
-        with patch.object(EnhancedLogHandler, '__init__', return_value=None):
-            self.handler = EnhancedLogHandler()
-            # Mock the required attributes
-            self.handler.rfile = io.BytesIO()
-            self.handler.wfile = io.BytesIO()
-            self.handler.headers = {}
-            self.handler.path = '/'
-            self.handler.log_file = '/tmp/test_sync.log'
-            self.handler.send_response = Mock()
-            self.handler.send_header = Mock()
-            self.handler.end_headers = Mock()
-        
+        self.handler = _TestHandler()
+        # Mock the required attributes
+        self.handler.rfile = io.BytesIO()
+        self.handler.wfile = io.BytesIO()
+        self.handler.headers = {}
+        self.handler.path = '/'
+        self.handler.log_file = '/tmp/test_sync.log'
+
         # Mock required methods
-        self.handler.send_response = Mock()
-        self.handler.send_header = Mock()
-        self.handler.end_headers = Mock()
-        self.handler.send_error = Mock()
+        self.handler.send_response = _Recorder()
+        self.handler.send_header = _Recorder()
+        self.handler.end_headers = _Recorder()
+        self.handler.send_error = _Recorder()
         self.handler.address_string = Mock(return_value='127.0.0.1')
+
+        # Isolate do_GET from module state: drop any warm render cache
+        # entry and point LOG_FILE away from the real container log
+        web_server._page_cache = (None, b'')
+        self._patchers = [patch('web_server.LOG_FILE', _fresh_log_path())]
+        for patcher in self._patchers:
+            patcher.start()
+
+    def teardown_method(self):
+        for patcher in self._patchers:
+            patcher.stop()
     
     def test_root_endpoint_get(self):
         """Test GET request to root endpoint."""
         self.handler.path = '/'
         
         with patch.object(self.handler, 'safe_read_log', return_value='test log content'), \
-             patch('os.getloadavg', return_value=(1.0, 1.1, 1.2)), \
-             patch.object(self.handler, 'generate_html_page', return_value='<html>test</html>'):
-            
+             patch('os.getloadavg', return_value=(1.0, 1.1, 1.2)):
+
+
             self.handler.do_GET()
             
             # Should send 200 response
-            self.handler.send_response.assert_called_with(200)
+            assert self.handler.send_response.calls[-1] == ((200,), {})
             # Should set HTML content type
-            self.handler.send_header.assert_any_call('Content-type', 'text/html; charset=utf-8')
+            assert (('Content-type', 'text/html; charset=utf-8'), {}) in self.handler.send_header.calls
             # Should set no-cache header
-            self.handler.send_header.assert_any_call('Cache-Control', 'no-cache')
+            assert (('Cache-Control', 'no-cache'), {}) in self.handler.send_header.calls
     
     def test_logs_endpoint_get(self):
         """Test GET request to /logs endpoint."""
         self.handler.path = '/logs'
         
         with patch.object(self.handler, 'safe_read_log', return_value='test log content'), \
-             patch('os.getloadavg', return_value=(0.5, 0.6, 0.7)), \
-             patch.object(self.handler, 'generate_html_page', return_value='<html>logs</html>'):
-            
+             patch('os.getloadavg', return_value=(0.5, 0.6, 0.7)):
+
+
             self.handler.do_GET()
             
             # Should send 200 response  
-            self.handler.send_response.assert_called_with(200)
+            assert self.handler.send_response.calls[-1] == ((200,), {})
             # Should set HTML content type
-            self.handler.send_header.assert_any_call('Content-type', 'text/html; charset=utf-8')
+            assert (('Content-type', 'text/html; charset=utf-8'), {}) in self.handler.send_header.calls
     
     def test_api_status_endpoint(self):
         """Test /api/status endpoint."""
         self.handler.path = '/api/status'
         
-        with patch('os.path.exists', return_value=True), \
-             patch('os.path.getsize', return_value=1024*1024*2):  # 2MB
-            
-            self.handler.do_GET()
-            
-            # Should send 200 response
-            self.handler.send_response.assert_called_with(200)
-            # Should set JSON content type
-            self.handler.send_header.assert_any_call('Content-type', 'application/json')
+        # /api/status sizes the log through _cached_log_stat, so the old
+        # os.path.exists/getsize patches no longer reach anything
+        self.handler.do_GET()
+
+        # Should send 200 response
+        assert self.handler.send_response.calls[-1] == ((200,), {})
+        # Should set JSON content type
+        assert (('Content-type', 'application/json'), {}) in self.handler.send_header.calls
     
     def test_favicon_endpoint(self):
         """Test /favicon.ico endpoint."""
@@ -104,11 +169,11 @@ class TestWebEndpoints:
         self.handler.do_GET()
         
         # Should send 200 response
-        self.handler.send_response.assert_called_with(200)
+        assert self.handler.send_response.calls[-1] == ((200,), {})
         # Should set SVG content type
-        self.handler.send_header.assert_any_call('Content-type', 'image/svg+xml')
+        assert (('Content-type', 'image/svg+xml'), {}) in self.handler.send_header.calls
         # Should set cache header
-        self.handler.send_header.assert_any_call('Cache-Control', 'max-age=86400')
+        assert (('Cache-Control', 'max-age=86400'), {}) in self.handler.send_header.calls
     
     def test_not_found_endpoint(self):
         """Test 404 for unknown endpoints."""
@@ -117,7 +182,7 @@ class TestWebEndpoints:
         self.handler.do_GET()
         
         # Should send 404 error
-        self.handler.send_error.assert_called_with(404, 'Not found')
+        assert self.handler.send_error.calls[-1] == ((404, 'Not found'), {})
     
     def test_get_exception_handling(self):
         """Test exception handling in GET requests."""
@@ -127,10 +192,10 @@ class TestWebEndpoints:
             self.handler.do_GET()
             
             # Should send 500 error
-            self.handler.send_error.assert_called()
-            error_call = self.handler.send_error.call_args
-            assert error_call[0][0] == 500  # Status code
-            assert 'Internal server error' in error_call[0][1]
+            assert self.handler.send_error.calls
+            error_args, _ = self.handler.send_error.calls[-1]
+            assert error_args[0] == 500  # Status code
+            assert 'Internal server error' in error_args[1]
 
 
 class TestPostEndpoints:
@@ -138,63 +203,70 @@ class TestPostEndpoints:
     
     def setup_method(self):
         """Setup test handler for each test."""
-        # Mock the handler initialization
-        with patch.object(EnhancedLogHandler, '__init__', return_value=None):
-            self.handler = EnhancedLogHandler()
-            # Mock the required attributes
-            self.handler.rfile = io.BytesIO()
-            self.handler.wfile = io.BytesIO()
-            self.handler.headers = {'Content-Length': '0'}
-            self.handler.path = '/'
-            self.handler.log_file = '/tmp/test_sync.log'
-            
-            # Mock required methods
-            self.handler.send_response = Mock()
-            self.handler.send_header = Mock()
-            self.handler.end_headers = Mock()
-        self.handler.end_headers = Mock()
-        self.handler.send_error = Mock()
-    
+        self.handler = _TestHandler()
+        # Mock the required attributes
+        self.handler.rfile = io.BytesIO()
+        self.handler.wfile = io.BytesIO()
+        self.handler.headers = {'Content-Length': '0'}
+        self.handler.path = '/'
+        self.handler.log_file = '/tmp/test_sync.log'
+
+        # Mock required methods
+        self.handler.send_response = _Recorder()
+        self.handler.send_header = _Recorder()
+        self.handler.end_headers = _Recorder()
+        self.handler.send_error = _Recorder()
+
+        # Patches common to every test in this class, started once per
+        # test here instead of re-entered as context managers in each body
+        self._patchers = [
+            patch('os.path.exists', return_value=True),
+            patch('web_server._write_line'),
+        ]
+        self._mock_exists, self._mock_write_line = (p.start() for p in self._patchers)
+        _MOCK_OPEN.reset_mock()
+
+    def teardown_method(self):
+        for patcher in self._patchers:
+            patcher.stop()
+
     def test_clear_logs_endpoint(self):
         """Test POST to /clear endpoint."""
         self.handler.path = '/clear'
         self.handler.headers = {'Content-Length': '0'}
-        
-        with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open()) as mock_file:
-            
-            self.handler.do_POST()
-            
-            # Should write to both log files
-            assert mock_file.call_count >= 2
-            # Should send success response
-            self.handler.send_response.assert_called_with(200)
+
+        self.handler.do_POST()
+
+        # Should write to both log files
+        assert self._mock_write_line.call_count >= 2
+        # Should send success response
+        assert self.handler.send_response.calls[-1] == ((200,), {})
     
     def test_run_sync_endpoint(self, mock_subprocess):
         """Test POST to /run endpoint."""
         self.handler.path = '/run'
         self.handler.headers = {'Content-Length': '0'}
         
-        with patch('builtins.open', mock_open()):
+        with patch('builtins.open', _MOCK_OPEN):
             self.handler.do_POST()
             
             # Should start subprocess
             mock_subprocess.assert_called_once()
             # Should send success response
-            self.handler.send_response.assert_called_with(200)
+            assert self.handler.send_response.calls[-1] == ((200,), {})
     
     def test_run_sync_subprocess_error(self):
         """Test /run endpoint with subprocess error."""
         self.handler.path = '/run'
         self.handler.headers = {'Content-Length': '0'}
         
-        with patch('builtins.open', mock_open()), \
+        with patch('builtins.open', _MOCK_OPEN), \
              patch('subprocess.Popen', side_effect=OSError('Process failed')):
             
             self.handler.do_POST()
             
             # Should send 500 error response
-            self.handler.send_response.assert_called_with(500)
+            assert self.handler.send_response.calls[-1] == ((500,), {})
     
     def test_post_request_size_limit(self):
         """Test POST request size limit enforcement."""
@@ -204,39 +276,33 @@ class TestPostEndpoints:
         self.handler.do_POST()
         
         # Should reject with 413 error
-        self.handler.send_error.assert_called_with(413, 'Request entity too large')
+        assert self.handler.send_error.calls[-1] == ((413, 'Request entity too large'), {})
     
-    def test_post_invalid_json(self):
+    def test_post_invalid_json(self, rfile):
         """Test POST with invalid JSON data."""
         self.handler.path = '/clear'
-        self.handler.headers = {
-            'Content-Length': '20',
-            'Content-Type': 'application/json'
-        }
-        self.handler.rfile = io.BytesIO(b'invalid json data}')
+        self.handler.headers = _INVALID_JSON_HEADERS
+        rfile.write(_INVALID_JSON)
+        rfile.seek(0)
+        self.handler.rfile = rfile
         
         self.handler.do_POST()
         
         # Should reject with 400 error
-        self.handler.send_error.assert_called_with(400, 'Invalid request data')
+        assert self.handler.send_error.calls[-1] == ((400, 'Invalid request data'), {})
     
-    def test_post_valid_json(self):
+    def test_post_valid_json(self, rfile):
         """Test POST with valid JSON data."""
         self.handler.path = '/clear'
-        json_data = json.dumps({'test': 'data'})
-        self.handler.headers = {
-            'Content-Length': str(len(json_data)),
-            'Content-Type': 'application/json'
-        }
-        self.handler.rfile = io.BytesIO(json_data.encode())
-        
-        with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open()):
-            
-            self.handler.do_POST()
-            
-            # Should process successfully
-            self.handler.send_response.assert_called_with(200)
+        self.handler.headers = _VALID_JSON_HEADERS
+        rfile.write(_VALID_JSON)
+        rfile.seek(0)
+        self.handler.rfile = rfile
+
+        self.handler.do_POST()
+
+        # Should process successfully
+        assert self.handler.send_response.calls[-1] == ((200,), {})
     
     def test_post_unknown_endpoint(self):
         """Test POST to unknown endpoint."""
@@ -246,7 +312,7 @@ class TestPostEndpoints:
         self.handler.do_POST()
         
         # Should send 404 error
-        self.handler.send_error.assert_called_with(404, 'Endpoint not found')
+        assert self.handler.send_error.calls[-1] == ((404, 'Endpoint not found'), {})
 
 
 class TestSecurityHeaders:
@@ -254,66 +320,74 @@ class TestSecurityHeaders:
     
     def setup_method(self):
         """Setup test handler."""
-        with patch.object(EnhancedLogHandler, '__init__', return_value=None):
-            self.handler = EnhancedLogHandler()
-            self.handler.rfile = io.BytesIO()
-            self.handler.wfile = io.BytesIO()
-            self.handler.headers = {'Content-Length': '0'}
-            self.handler.path = '/clear'
-            self.handler.log_file = '/tmp/test_sync.log'
-            
-            self.handler.send_response = Mock()
-            self.handler.send_header = Mock()
-            self.handler.end_headers = Mock()
-            self.handler.send_error = Mock()
-    
+        self.handler = _TestHandler()
+        self.handler.rfile = io.BytesIO()
+        self.handler.wfile = io.BytesIO()
+        self.handler.headers = {'Content-Length': '0'}
+        self.handler.path = '/clear'
+        self.handler.log_file = '/tmp/test_sync.log'
+
+        self.handler.send_response = _Recorder()
+        self.handler.send_header = _Recorder()
+        self.handler.end_headers = _Recorder()
+        self.handler.send_error = _Recorder()
+
+        # Patches common to every test in this class
+        self._patchers = [
+            patch('os.path.exists', return_value=True),
+            patch('web_server._write_line'),
+        ]
+        for patcher in self._patchers:
+            patcher.start()
+
+    def teardown_method(self):
+        for patcher in self._patchers:
+            patcher.stop()
+
     def test_security_headers_added(self):
         """Test that security headers are added to responses."""
-        with patch('os.path.exists', return_value=True), \
-             patch('builtins.open', mock_open()):
-            
-            self.handler.do_POST()
-            
-            # Check that security headers were set
-            header_calls = [call[0] for call in self.handler.send_header.call_args_list]
-            
-            security_headers = [
-                ('X-Content-Type-Options', 'nosniff'),
-                ('X-Frame-Options', 'DENY'),
-                ('Cache-Control', 'no-cache, no-store, must-revalidate')
-            ]
-            
-            for header, value in security_headers:
-                assert any(header == call[0] and value == call[1] for call in header_calls), \
-                       f'Security header {header}: {value} not found'
-    
-    def test_content_type_validation(self):
-        """Test content type validation in POST requests."""
-        test_cases = [
-            ('application/json', True),
-            ('text/plain', False),
-            ('application/xml', False),
-            ('', False)
+        self.handler.do_POST()
+
+        # Check that security headers were set
+        header_calls = [args for args, _ in self.handler.send_header.calls]
+
+        security_headers = [
+            ('X-Content-Type-Options', 'nosniff'),
+            ('X-Frame-Options', 'DENY'),
+            ('Cache-Control', 'no-cache, no-store, must-revalidate')
         ]
-        
-        for content_type, should_process in test_cases:
-            self.handler.headers = {
-                'Content-Length': '10',
-                'Content-Type': content_type
-            }
-            self.handler.rfile = io.BytesIO(b'test data!')
-            
-            # Reset mocks
-            self.handler.send_error.reset_mock()
-            
-            with patch('os.path.exists', return_value=True), \
-                 patch('builtins.open', mock_open()):
-                
-                self.handler.do_POST()
-                
-                if not should_process and content_type:
-                    # Non-JSON content types should still process (they just won't be parsed as JSON)
-                    pass  # Current implementation doesn't reject non-JSON content types
+
+        for header, value in security_headers:
+            assert any(header == call[0] and value == call[1] for call in header_calls), \
+                   f'Security header {header}: {value} not found'
+
+    # One case per content type; setup_method rebuilds the recorders so
+    # the old in-loop reset_mock/patch dance is unnecessary
+    @pytest.mark.parametrize('content_type,parsed_as_json', [
+        ('application/json', True),
+        ('text/plain', False),
+        ('application/xml', False),
+        ('', False)
+    ])
+    def test_content_type_validation(self, rfile, content_type, parsed_as_json):
+        """Test content type validation in POST requests."""
+        self.handler.headers = {
+            'Content-Length': '10',
+            'Content-Type': content_type
+        }
+        rfile.write(b'test data!')
+        rfile.seek(0)
+        self.handler.rfile = rfile
+
+        self.handler.do_POST()
+
+        if parsed_as_json:
+            # A JSON content type makes the non-JSON body a 400
+            assert self.handler.send_error.calls[-1] == ((400, 'Invalid request data'), {})
+        else:
+            # Non-JSON content types pass through unparsed
+            assert not self.handler.send_error.calls
+            assert self.handler.send_response.calls[-1] == ((200,), {})
 
 
 class TestErrorHandling:
@@ -321,19 +395,30 @@ class TestErrorHandling:
     
     def setup_method(self):
         """Setup test handler."""
-        with patch.object(EnhancedLogHandler, '__init__', return_value=None):
-            self.handler = EnhancedLogHandler()
-            self.handler.rfile = io.BytesIO()
-            self.handler.wfile = io.BytesIO()
-            self.handler.headers = {}
-            self.handler.path = '/'
-            self.handler.log_file = '/tmp/test_sync.log'
-            
-            self.handler.send_response = Mock()
-            self.handler.send_header = Mock()
-            self.handler.end_headers = Mock()
-            self.handler.send_error = Mock()
-    
+        self.handler = _TestHandler()
+        self.handler.rfile = io.BytesIO()
+        self.handler.wfile = io.BytesIO()
+        self.handler.headers = {}
+        self.handler.path = '/'
+        self.handler.log_file = '/tmp/test_sync.log'
+
+        self.handler.send_response = _Recorder()
+        self.handler.send_header = _Recorder()
+        self.handler.end_headers = _Recorder()
+        self.handler.send_error = _Recorder()
+
+        # Same do_GET isolation as TestWebEndpoints: these tests rely on
+        # their patched readers actually running, which a warm render
+        # cache entry for the real log would skip
+        web_server._page_cache = (None, b'')
+        self._patchers = [patch('web_server.LOG_FILE', _fresh_log_path())]
+        for patcher in self._patchers:
+            patcher.start()
+
+    def teardown_method(self):
+        for patcher in self._patchers:
+            patcher.stop()
+
     def test_file_access_error_handling(self):
         """Test handling of file access errors."""
         self.handler.path = '/'
@@ -342,20 +427,20 @@ class TestErrorHandling:
             self.handler.do_GET()
             
             # Should handle error gracefully
-            self.handler.send_error.assert_called()
+            assert self.handler.send_error.calls
     
     def test_load_average_error_handling(self):
         """Test handling of load average calculation errors."""
         self.handler.path = '/'
         
         with patch.object(self.handler, 'safe_read_log', return_value='test'), \
-             patch('os.getloadavg', side_effect=OSError('Not supported')), \
-             patch.object(self.handler, 'generate_html_page', return_value='<html>test</html>'):
-            
+             patch('os.getloadavg', side_effect=OSError('Not supported')):
+
+
             self.handler.do_GET()
             
             # Should use default load average (0, 0, 0)
-            self.handler.send_response.assert_called_with(200)
+            assert self.handler.send_response.calls[-1] == ((200,), {})
     
     def test_html_generation_error(self):
         """Test error handling in HTML generation."""
@@ -363,12 +448,12 @@ class TestErrorHandling:
         
         with patch.object(self.handler, 'safe_read_log', return_value='test'), \
              patch('os.getloadavg', return_value=(1.0, 1.1, 1.2)), \
-             patch.object(self.handler, 'generate_html_page', side_effect=Exception('Template error')):
+             patch.object(self.handler, '_render_dynamic', side_effect=Exception('Template error')):
             
             self.handler.do_GET()
             
             # Should send error response
-            self.handler.send_error.assert_called()
+            assert self.handler.send_error.calls
     
     def test_post_exception_handling(self):
         """Test exception handling in POST requests."""
@@ -379,4 +464,4 @@ class TestErrorHandling:
             self.handler.do_POST()
             
             # Should send error response with proper headers
-            self.handler.send_response.assert_called_with(500)
\ No newline at end of file
+            assert self.handler.send_response.calls[-1] == ((500,), {})
\ No newline at end of file